@@ -0,0 +1,310 @@
+"use client";
+
+import { memo, useCallback, useEffect, useMemo, useRef, useState } from "react";
+
+// One NDJSON row from /api/ping/sweep?format=ndjson (ping.export.COLUMNS)
+type SweepRow = {
+  host: string;
+  resolved_ip: string | null;
+  protocol: string | null;
+  alive: boolean;
+  rtt_ms: number | null;
+  packets_sent: number | null;
+  packets_received: number | null;
+  packet_loss_percent: number | null;
+  icmp_type: number | null;
+  error: string | null;
+};
+
+type SortKey = "host" | "alive" | "protocol" | "rtt_ms" | "error";
+type SortDir = "asc" | "desc";
+
+const ROW_HEIGHT = 28;
+const VIEWPORT_HEIGHT = 480;
+const OVERSCAN = 10;
+
+const COLUMNS: { key: SortKey; label: string; width: string }[] = [
+  { key: "host", label: "Host", width: "w-2/5" },
+  { key: "alive", label: "Status", width: "w-1/6" },
+  { key: "protocol", label: "Protocol", width: "w-1/6" },
+  { key: "rtt_ms", label: "RTT (ms)", width: "w-1/6" },
+  { key: "error", label: "Error", width: "flex-1" },
+];
+
+function compare(
+  a: SweepRow,
+  b: SweepRow,
+  key: SortKey,
+  dir: SortDir
+): number {
+  const av = a[key];
+  const bv = b[key];
+  // Missing values always sort last, whichever the direction
+  if (av === null || av === undefined) {
+    return bv === null || bv === undefined ? 0 : 1;
+  }
+  if (bv === null || bv === undefined) return -1;
+  const sign = dir === "asc" ? 1 : -1;
+  if (typeof av === "number" && typeof bv === "number") {
+    return sign * (av - bv);
+  }
+  // "up" before "down"
+  if (typeof av === "boolean" && typeof bv === "boolean") {
+    return sign * (Number(bv) - Number(av));
+  }
+  return (
+    sign * String(av).localeCompare(String(bv), undefined, { numeric: true })
+  );
+}
+
+// Rows only re-render when their own object changes.
+const Row = memo(function Row({ row, top }: { row: SweepRow; top: number }) {
+  return (
+    <div
+      className="absolute left-0 right-0 flex items-center px-2 text-sm border-b border-gray-100 font-mono"
+      style={{ top, height: ROW_HEIGHT }}
+    >
+      <span className="w-2/5 truncate" title={row.resolved_ip ?? row.host}>
+        {row.host}
+      </span>
+      <span
+        className={`w-1/6 ${row.alive ? "text-green-600" : "text-red-600"}`}
+      >
+        {row.alive ? "up" : "down"}
+      </span>
+      <span className="w-1/6">{row.protocol ?? "—"}</span>
+      <span className="w-1/6">
+        {row.rtt_ms !== null ? row.rtt_ms.toFixed(3) : "—"}
+      </span>
+      <span className="flex-1 truncate text-gray-500" title={row.error ?? ""}>
+        {row.error ?? ""}
+      </span>
+    </div>
+  );
+});
+
+export default function SweepView({ apiBase }: { apiBase: string }) {
+  const [targets, setTargets] = useState("");
+  const [protocols, setProtocols] = useState("icmp,tcp,udp");
+  const [running, setRunning] = useState(false);
+  const [error, setError] = useState("");
+  const [sortKey, setSortKey] = useState<SortKey | null>(null);
+  const [sortDir, setSortDir] = useState<SortDir>("asc");
+  const [scrollTop, setScrollTop] = useState(0);
+  // Bumped once per animation frame that delivered rows
+  const [version, setVersion] = useState(0);
+
+  const rowsRef = useRef(new Map<string, SweepRow>());
+  const orderRef = useRef<string[]>([]);
+  const aliveRef = useRef(0);
+  const pendingRef = useRef<SweepRow[]>([]);
+  const frameRef = useRef<number | null>(null);
+  const abortRef = useRef<AbortController | null>(null);
+
+  const flush = useCallback(() => {
+    frameRef.current = null;
+    const batch = pendingRef.current;
+    if (batch.length === 0) return;
+    pendingRef.current = [];
+    const rows = rowsRef.current;
+    for (const row of batch) {
+      const prev = rows.get(row.host);
+      if (!prev) orderRef.current.push(row.host);
+      else if (prev.alive) aliveRef.current -= 1;
+      if (row.alive) aliveRef.current += 1;
+      rows.set(row.host, row);
+    }
+    setVersion((v) => v + 1);
+  }, []);
+
+  const enqueue = useCallback(
+    (row: SweepRow) => {
+      pendingRef.current.push(row);
+      if (frameRef.current === null) {
+        frameRef.current = requestAnimationFrame(flush);
+      }
+    },
+    [flush]
+  );
+
+  const stop = useCallback(() => {
+    abortRef.current?.abort();
+    abortRef.current = null;
+  }, []);
+
+  useEffect(() => {
+    const frame = frameRef;
+    return () => {
+      stop();
+      if (frame.current !== null) cancelAnimationFrame(frame.current);
+    };
+  }, [stop]);
+
+  async function start() {
+    const hosts = targets
+      .split(/[\s,]+/)
+      .map((t) => t.trim())
+      .filter(Boolean);
+    if (hosts.length === 0) return;
+
+    stop();
+    rowsRef.current = new Map();
+    orderRef.current = [];
+    aliveRef.current = 0;
+    pendingRef.current = [];
+    setVersion((v) => v + 1);
+    setError("");
+
+    const controller = new AbortController();
+    abortRef.current = controller;
+    setRunning(true);
+
+    const params = new URLSearchParams({
+      host: hosts.join(","),
+      protocols,
+      format: "ndjson",
+      batch: "32",
+    });
+    try {
+      const res = await fetch(`${apiBase}/ping/sweep?${params}`, {
+        signal: controller.signal,
+      });
+      if (!res.ok || !res.body) {
+        const data = await res.json().catch(() => ({}));
+        setError(data.error ?? `Sweep failed (${res.status})`);
+        return;
+      }
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split("\n");
+        buffered = lines.pop() ?? "";
+        for (const line of lines) {
+          if (line) enqueue(JSON.parse(line) as SweepRow);
+        }
+      }
+      if (buffered.trim()) enqueue(JSON.parse(buffered) as SweepRow);
+    } catch (err) {
+      if (!controller.signal.aborted) {
+        console.error(err);
+        setError("Error streaming sweep results");
+      }
+    } finally {
+      if (abortRef.current === controller) abortRef.current = null;
+      setRunning(false);
+    }
+  }
+
+  function toggleSort(key: SortKey) {
+    if (sortKey === key) {
+      if (sortDir === "asc") setSortDir("desc");
+      else setSortKey(null); // third click: back to arrival order
+    } else {
+      setSortKey(key);
+      setSortDir("asc");
+    }
+  }
+
+  const ordered = useMemo(() => {
+    const rows = rowsRef.current;
+    const list = orderRef.current.map((h) => rows.get(h)!);
+    if (sortKey) {
+      list.sort((a, b) => compare(a, b, sortKey, sortDir));
+    }
+    return list;
+    // version stands in for the mutable refs above
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [version, sortKey, sortDir]);
+
+  const total = ordered.length;
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const last = Math.min(
+    total,
+    Math.ceil((scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN
+  );
+  const visible = ordered.slice(first, last);
+
+  return (
+    <section className="w-full p-4 border rounded bg-white shadow-sm flex flex-col gap-3">
+      <div className="flex items-center justify-between">
+        <span className="text-sm font-medium">Live sweep</span>
+        <span className="text-xs text-gray-500">
+          {aliveRef.current}/{total} alive{running ? " · running…" : ""}
+        </span>
+      </div>
+
+      <div className="grid grid-cols-1 sm:grid-cols-[1fr_180px_auto] gap-3">
+        <input
+          type="text"
+          value={targets}
+          onChange={(e) => setTargets(e.target.value)}
+          placeholder="hosts or CIDRs, e.g. 192.168.1.0/24, example.com"
+          className="w-full px-3 py-2 border rounded bg-white text-gray-900"
+        />
+        <select
+          value={protocols}
+          onChange={(e) => setProtocols(e.target.value)}
+          className="w-full px-3 py-2 border rounded bg-white text-gray-900"
+        >
+          <option value="icmp,tcp,udp">Auto (first answer)</option>
+          <option value="icmp">ICMP</option>
+          <option value="tcp">TCP</option>
+          <option value="udp">UDP</option>
+          <option value="arp">ARP</option>
+        </select>
+        {running ? (
+          <button
+            onClick={stop}
+            className="px-4 py-2 border border-red-400 text-red-600 bg-red-50 rounded hover:bg-red-100"
+          >
+            Stop
+          </button>
+        ) : (
+          <button
+            onClick={start}
+            disabled={!targets.trim()}
+            className="px-4 py-2 border border-blue-400 text-blue-600 bg-blue-50 rounded hover:bg-blue-100 disabled:bg-gray-200 disabled:text-gray-400"
+          >
+            Start Sweep
+          </button>
+        )}
+      </div>
+
+      {error && <div className="text-sm text-red-600">{error}</div>}
+
+      <div className="flex px-2 text-xs font-medium text-gray-600 border-b">
+        {COLUMNS.map((col) => (
+          <button
+            key={col.key}
+            onClick={() => toggleSort(col.key)}
+            className={`${col.width} text-left py-1 hover:text-gray-900`}
+          >
+            {col.label}
+            {sortKey === col.key ? (sortDir === "asc" ? " ▲" : " ▼") : ""}
+          </button>
+        ))}
+      </div>
+
+      <div
+        className="relative overflow-auto"
+        style={{ height: VIEWPORT_HEIGHT }}
+        onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+      >
+        <div className="relative" style={{ height: total * ROW_HEIGHT }}>
+          {visible.map((row, i) => (
+            <Row key={row.host} row={row} top={(first + i) * ROW_HEIGHT} />
+          ))}
+        </div>
+        {total === 0 && (
+          <div className="absolute inset-0 flex items-center justify-center text-xs text-gray-500">
+            No results yet
+          </div>
+        )}
+      </div>
+    </section>
+  );
+}
@@ -0,0 +1,119 @@
+// IndexedDB-backed ping history. Each entry is written on its own, so adding
+// or updating one item never rewrites the whole list.
+
+const DB_NAME = "ping";
+const DB_VERSION = 1;
+const STORE = "history";
+const LEGACY_KEY = "pingHistory";
+const MAX_ENTRIES = 1000;
+
+export type StoredHistoryItem = {
+  id: string;
+  ts: number;
+  protocol: string;
+  host: string;
+  port?: number;
+  endpoint: string;
+  ok?: boolean;
+  body?: string;
+};
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+
+function openDB(): Promise<IDBDatabase> {
+  if (dbPromise) return dbPromise;
+  dbPromise = new Promise((resolve, reject) => {
+    const req = indexedDB.open(DB_NAME, DB_VERSION);
+    req.onupgradeneeded = () => {
+      const store = req.result.createObjectStore(STORE, { keyPath: "id" });
+      store.createIndex("ts", "ts");
+    };
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => {
+      dbPromise = null;
+      reject(req.error);
+    };
+  });
+  return dbPromise;
+}
+
+function done(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+}
+
+export async function putHistory(item: StoredHistoryItem): Promise<void> {
+  const db = await openDB();
+  const tx = db.transaction(STORE, "readwrite");
+  tx.objectStore(STORE).put(item);
+  await done(tx);
+}
+
+export async function listHistory(limit = 50): Promise<StoredHistoryItem[]> {
+  const db = await openDB();
+  const tx = db.transaction(STORE, "readonly");
+  const index = tx.objectStore(STORE).index("ts");
+  const items: StoredHistoryItem[] = [];
+  await new Promise<void>((resolve, reject) => {
+    const req = index.openCursor(null, "prev");
+    req.onsuccess = () => {
+      const cursor = req.result;
+      if (!cursor || items.length >= limit) return resolve();
+      items.push(cursor.value as StoredHistoryItem);
+      cursor.continue();
+    };
+    req.onerror = () => reject(req.error);
+  });
+  return items;
+}
+
+export async function clearHistory(): Promise<void> {
+  const db = await openDB();
+  const tx = db.transaction(STORE, "readwrite");
+  tx.objectStore(STORE).clear();
+  await done(tx);
+}
+
+// Drop everything but the newest MAX_ENTRIES, oldest first.
+export async function pruneHistory(max = MAX_ENTRIES): Promise<void> {
+  const db = await openDB();
+  const tx = db.transaction(STORE, "readwrite");
+  const store = tx.objectStore(STORE);
+  const countReq = store.count();
+  countReq.onsuccess = () => {
+    let excess = countReq.result - max;
+    if (excess <= 0) return;
+    const req = store.index("ts").openCursor();
+    req.onsuccess = () => {
+      const cursor = req.result;
+      if (!cursor || excess <= 0) return;
+      cursor.delete();
+      excess -= 1;
+      cursor.continue();
+    };
+  };
+  await done(tx);
+}
+
+// One-time import of the old localStorage array. The legacy key is only
+// removed once the IndexedDB transaction has committed; on any failure it
+// is left in place and the error propagates, so the next load retries.
+export async function migrateLegacyHistory(): Promise<void> {
+  let raw: string | null = null;
+  try {
+    raw = localStorage.getItem(LEGACY_KEY);
+  } catch {
+    return; // storage disabled: nothing to migrate
+  }
+  if (!raw) return;
+  const items = JSON.parse(raw) as StoredHistoryItem[];
+  const db = await openDB();
+  const tx = db.transaction(STORE, "readwrite");
+  const store = tx.objectStore(STORE);
+  for (const item of items) store.put(item);
+  await done(tx);
+  localStorage.removeItem(LEGACY_KEY);
+}
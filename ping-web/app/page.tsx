@@ -2,6 +2,17 @@
 
 import { useEffect, useState } from "react";
 
+import SweepView from "./SweepView";
+import {
+  clearHistory,
+  listHistory,
+  migrateLegacyHistory,
+  pruneHistory,
+  putHistory,
+} from "./historyStore";
+
+const API_BASE = "http://127.0.0.1:8080/api";
+
 type Protocol = "icmp" | "tcp" | "arp" | "udp" | "rdns";
 
 type HistoryItem = {
@@ -23,21 +34,18 @@ export default function Home() {
   const [history, setHistory] = useState<HistoryItem[]>([]);
 
   useEffect(() => {
-    try {
-      const raw = localStorage.getItem("pingHistory");
-      if (raw) setHistory(JSON.parse(raw));
-    } catch {}
+    // A failed migration keeps the legacy key for next time; still load
+    // whatever is already in IndexedDB.
+    migrateLegacyHistory()
+      .catch((err) => console.error(err))
+      .then(() => listHistory(50))
+      .then((items) => setHistory(items as HistoryItem[]))
+      .catch((err) => console.error(err));
   }, []);
 
-  useEffect(() => {
-    try {
-      localStorage.setItem("pingHistory", JSON.stringify(history.slice(0, 50)));
-    } catch {}
-  }, [history]);
-
   async function callAPI(endpoint: string) {
     try {
-      const res = await fetch(`http://127.0.0.1:8080/api/${endpoint}`);
+      const res = await fetch(`${API_BASE}/${endpoint}`);
       const data = await res.json();
       const body = JSON.stringify(data, null, 2);
       setMessage(body);
@@ -99,13 +107,14 @@ export default function Home() {
     };
 
     setHistory((prev) => [pending, ...prev].slice(0, 50));
+    putHistory(pending).catch((err) => console.error(err));
 
     const res = await callAPI(endpoint);
-    setHistory((prev) =>
-      prev.map((it) =>
-        it.id === pending.id ? { ...it, ok: res.ok, body: res.body } : it
-      )
-    );
+    const settled = { ...pending, ok: res.ok, body: res.body };
+    setHistory((prev) => prev.map((it) => (it.id === pending.id ? settled : it)));
+    putHistory(settled)
+      .then(() => pruneHistory())
+      .catch((err) => console.error(err));
   }
 
   return (
@@ -117,7 +126,10 @@ export default function Home() {
             <div className="flex items-center justify-between mb-2">
               <span className="text-sm font-medium">Recent</span>
               <button
-                onClick={() => setHistory([])}
+                onClick={() => {
+                  setHistory([]);
+                  clearHistory().catch((err) => console.error(err));
+                }}
                 className="text-xs text-red-600 hover:underline"
               >
                 Clear
@@ -240,6 +252,10 @@ export default function Home() {
           )}
         </main>
       </div>
+
+      <div className="max-w-5xl w-full mx-auto mt-6">
+        <SweepView apiBase={API_BASE} />
+      </div>
     </div>
   );
 }
@@ -0,0 +1,3 @@
+from ping.core import main
+
+main()
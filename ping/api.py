@@ -1,9 +1,15 @@
 # api.py
-from flask import Flask, jsonify, request
+import ipaddress
+from typing import Iterator, List
+
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 
-from ping.arp import arp_ping
+from ping.arp import arp_ping, arp_sweep
+from ping.core import iter_sweep, iter_targets, sweep
+from ping.export import FORMATS, MIME_TYPES, iter_export
 from ping.icmp import icmp_ping
+from ping.pmtu import pmtu_discover
 from ping.tcp import tcp_ping
 from ping.udp import udp_ping
 from ping.rdns import rdns_lookup
@@ -11,6 +17,29 @@ from ping.rdns import rdns_lookup
 app = Flask(__name__)
 CORS(app)
 
+# Most addresses one sweep request may expand to (a /16)
+MAX_SWEEP_ADDRESSES = 1 << 16
+
+
+def _sweep_targets(hosts: List[str], arp: bool = False) -> Iterator[str]:
+    # Validate every CIDR up front (ValueError -> 400), then expand lazily.
+    total = 0
+    for host in hosts:
+        if "/" not in host:
+            if arp and ":" in host:
+                raise ValueError("ARP sweeps are IPv4 only")
+            total += 1
+            continue
+        net = ipaddress.ip_network(host, strict=False)
+        if arp and net.version != 4:
+            raise ValueError("ARP sweeps are IPv4 only")
+        total += net.num_addresses
+        if total > MAX_SWEEP_ADDRESSES:
+            raise ValueError(
+                f"sweep may cover at most {MAX_SWEEP_ADDRESSES} addresses"
+            )
+    return iter_targets(hosts)
+
 
 @app.route("/api/health", methods=["GET"])
 def run_health_check():
@@ -40,6 +69,22 @@ def run_icmp_ping():
         return jsonify({"error": "ICMP requires admin/root privileges on this OS"}), 500
 
 
+@app.route("/api/ping/pmtu", methods=["GET"])
+def run_pmtu_discover():
+    host = request.args.get("host", type=str)
+    if not host:
+        return jsonify({"error": "Host parameter is required"}), 400
+    timeout = request.args.get("timeout", type=float, default=1.0)
+    max_mtu = request.args.get("max_mtu", type=int, default=1500)
+    if not (68 <= max_mtu <= 65535):
+        return jsonify({"error": "max_mtu must be between 68 and 65535"}), 400
+    try:
+        result = pmtu_discover(host, timeout=timeout, max_mtu=max_mtu)
+        return jsonify(result)
+    except PermissionError:
+        return jsonify({"error": "ICMP requires admin/root privileges on this OS"}), 500
+
+
 @app.route("/api/ping/tcp", methods=["GET"])
 def run_tcp_ping():
     host = request.args.get("host", type=str)
@@ -62,6 +107,21 @@ def run_arp_ping():
     return jsonify(result)
 
 
+@app.route("/api/ping/arp/sweep", methods=["GET"])
+def run_arp_sweep():
+    cidr = request.args.get("cidr", type=str)
+    if not cidr:
+        return jsonify({"error": "CIDR parameter is required"}), 400
+    try:
+        net = ipaddress.ip_network(cidr, strict=False)
+        _sweep_targets([str(net)], arp=True)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    timeout = request.args.get("timeout", type=float, default=1.0)
+    result = arp_sweep(str(net), timeout=timeout)
+    return jsonify(result)
+
+
 @app.route("/api/ping/udp", methods=["GET"])
 def run_udp_ping():
     host = request.args.get("host", type=str)
@@ -75,6 +135,62 @@ def run_udp_ping():
     return jsonify(result)
 
 
+@app.route("/api/ping/sweep", methods=["GET"])
+def run_sweep():
+    hosts = [h.strip() for h in request.args.get("host", "", type=str).split(",")]
+    hosts = [h for h in hosts if h]
+    if not hosts:
+        return jsonify({"error": "Host parameter is required"}), 400
+    protocols = request.args.get("protocols", "icmp,tcp,udp", type=str).split(",")
+    protocols = [p.strip() for p in protocols if p.strip()]
+    if any(p not in ("icmp", "tcp", "udp", "arp") for p in protocols):
+        return jsonify({"error": "protocols must be icmp, tcp, udp or arp"}), 400
+    timeout = request.args.get("timeout", type=float, default=1.0)
+    stagger = request.args.get("stagger", type=float, default=0.25)
+    first_alive = request.args.get("all", type=int, default=0) == 0
+    port = request.args.get("port", type=int, default=80)
+    if not (1 <= port <= 65535):
+        return jsonify({"error": "Port must be between 1 and 65535"}), 400
+    try:
+        targets = _sweep_targets(hosts, arp="arp" in protocols)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    fmt = request.args.get("format", type=str)
+    if fmt:
+        if fmt not in FORMATS:
+            return jsonify({"error": f"format must be one of {', '.join(FORMATS)}"}), 400
+        if fmt in ("arrow", "parquet"):
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                return jsonify({"error": f"{fmt} export requires pyarrow"}), 500
+        batch = request.args.get("batch", type=int, default=256)
+        results = iter_sweep(
+            targets,
+            protocols=protocols,
+            timeout=timeout,
+            stagger=stagger,
+            first_alive=first_alive,
+            tcp_port=port,
+        )
+        return Response(
+            stream_with_context(
+                iter_export(results, format=fmt, batch_size=max(1, min(batch, 4096)))
+            ),
+            mimetype=MIME_TYPES[fmt],
+        )
+    single = len(hosts) == 1 and "/" not in hosts[0]
+    result = sweep(
+        hosts[0] if single else targets,
+        protocols=protocols,
+        timeout=timeout,
+        stagger=stagger,
+        first_alive=first_alive,
+        tcp_port=port,
+    )
+    return jsonify(result)
+
+
 if __name__ == "__main__":
     # For dev: avoid double-run issues with raw sockets
     app.run(host="0.0.0.0", port=8080, debug=True, use_reloader=False)
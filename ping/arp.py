@@ -1,17 +1,151 @@
+from __future__ import annotations
+import ipaddress
+import json
+import subprocess
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
 from scapy.all import Ether, ARP, srp
 
+from ping.transport import get_transport
+
+# Kernel neighbor states that prove the host answered recently. The
+# /proc/net/arp fallback has no NUD state: its COMPLETE also covers STALE and
+# DELAY entries, which Linux can keep for hours, so those are only hints and
+# always get re-verified on the wire.
+FRESH_STATES = frozenset({"REACHABLE", "PERMANENT", "NOARP"})
+
+# /proc/net/arp flags
+_ATF_COM = 0x02
+_ATF_PERM = 0x04
+
+# ip -> (result, expires_at)
+_ARP_CACHE: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+
+def clear_arp_cache() -> None:
+    _ARP_CACHE.clear()
+
+
+def _cache_get(ip: str) -> Optional[Dict[str, Any]]:
+    entry = _ARP_CACHE.get(ip)
+    if entry is None:
+        return None
+    res, expires = entry
+    if time.monotonic() >= expires:
+        _ARP_CACHE.pop(ip, None)
+        return None
+    return dict(res, source="cache", rtt_ms=None)
+
+
+def _cache_put(res: Dict[str, Any], ttl: float) -> None:
+    # Only positive answers are cached; a dead host is re-probed next time.
+    if ttl > 0 and res.get("alive"):
+        _ARP_CACHE[res["host"]] = (res, time.monotonic() + ttl)
+
+
+def _parse_ip_neigh_json(text: str) -> Dict[str, Dict[str, Any]]:
+    table: Dict[str, Dict[str, Any]] = {}
+    for entry in json.loads(text or "[]"):
+        ip = entry.get("dst")
+        if not ip:
+            continue
+        table[ip] = {
+            "mac": entry.get("lladdr"),
+            "iface": entry.get("dev"),
+            "state": (entry.get("state") or ["NONE"])[0],
+        }
+    return table
+
+
+def _parse_proc_arp(text: str) -> Dict[str, Dict[str, Any]]:
+    # /proc/net/arp has no NUD state, only "complete"/"permanent" flags;
+    # COMPLETE is not in FRESH_STATES.
+    table: Dict[str, Dict[str, Any]] = {}
+    for line in (text or "").splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+        try:
+            flags = int(parts[2], 16)
+        except ValueError:
+            continue
+        if flags & _ATF_PERM:
+            state = "PERMANENT"
+        elif flags & _ATF_COM:
+            state = "COMPLETE"
+        else:
+            state = "INCOMPLETE"
+        table[parts[0]] = {"mac": parts[3], "iface": parts[5], "state": state}
+    return table
+
+
+def read_neighbor_table(proc_path: str = "/proc/net/arp") -> Dict[str, Dict[str, Any]]:
+    """
+    Bulk-read the kernel IPv4 neighbor table: `ip -j neigh` (netlink, with NUD
+    state) when available, else /proc/net/arp. Returns {} on other OSes.
+    """
+    try:
+        proc = subprocess.run(
+            ["ip", "-j", "-4", "neigh", "show"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if proc.returncode == 0:
+            return _parse_ip_neigh_json(proc.stdout)
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        pass
+    try:
+        with open(proc_path) as fh:
+            return _parse_proc_arp(fh.read())
+    except OSError:
+        return {}
+
+
+def _result(host_ip: str) -> Dict[str, Any]:
+    return {
+        "host": host_ip,
+        "alive": False,
+        "rtt_ms": None,
+        "mac": None,
+        "source": "arp",
+        "error": "No response",
+    }
+
 
-def arp_ping(host_ip: str, timeout: float = 1.0) -> dict:
+def arp_ping(
+    host_ip: str,
+    timeout: float = 1.0,
+    use_cache: bool = False,
+    use_neighbors: bool = False,
+    cache_ttl: float = 30.0,
+) -> dict:
     """
     Performs an ARP ping on the local network segment.
     """
+    if use_cache:
+        cached = _cache_get(host_ip)
+        if cached is not None:
+            return cached
+    if use_neighbors:
+        warm = _from_neighbors([host_ip], read_neighbor_table(), FRESH_STATES)
+        if warm:
+            if use_cache:
+                _cache_put(warm[host_ip], cache_ttl)
+            return warm[host_ip]
+
     # Create an ARP request for the target IP, broadcasting on Layer 2
     arp_request = Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=host_ip)
 
     # Send the packet and wait for a response
-    answered, unanswered = srp(arp_request, timeout=timeout, verbose=0)
+    transport = get_transport()
+    answered, unanswered = (transport.srp if transport else srp)(
+        arp_request, timeout=timeout, verbose=0
+    )
 
-    result = {"host": host_ip, "alive": False, "rtt_ms": None, "error": "No response"}
+    result = _result(host_ip)
 
     if answered:
         # srp returns a list of (sent packet, received packet) tuples
@@ -19,9 +153,118 @@ def arp_ping(host_ip: str, timeout: float = 1.0) -> dict:
         result["rtt_ms"] = round((received_pkt.time - sent_pkt.time) * 1000, 3)
         result["alive"] = True
         result["error"] = None
+        if received_pkt.haslayer(ARP):
+            result["mac"] = received_pkt.getlayer(ARP).hwsrc
+        if use_cache:
+            _cache_put(result, cache_ttl)
 
     return result
 
 
+def _from_neighbors(
+    hosts: Iterable[str], table: Dict[str, Dict[str, Any]], fresh_states
+) -> Dict[str, Dict[str, Any]]:
+    warm: Dict[str, Dict[str, Any]] = {}
+    for ip in hosts:
+        entry = table.get(ip)
+        if entry and entry.get("mac") and entry.get("state") in fresh_states:
+            res = _result(ip)
+            res.update(alive=True, mac=entry["mac"], source="neighbor", error=None)
+            warm[ip] = res
+    return warm
+
+
+def _iter_hosts(hosts: Union[str, Iterable[str]]) -> Iterator[str]:
+    if not isinstance(hosts, str):
+        yield from hosts
+        return
+    net = ipaddress.ip_network(hosts, strict=False)
+    if net.version != 4:
+        raise ValueError("ARP sweeps are IPv4 only")
+    if net.num_addresses == 1:
+        yield str(net.network_address)
+        return
+    for ip in net.hosts():
+        yield str(ip)
+
+
+def arp_sweep(
+    hosts: Union[str, Iterable[str]],
+    timeout: float = 1.0,
+    use_cache: bool = True,
+    use_neighbors: bool = True,
+    cache_ttl: float = 30.0,
+    fresh_states: Iterable[str] = FRESH_STATES,
+    chunk: int = 256,
+) -> Dict[str, Any]:
+    """
+    ARP-sweep a list of IPs or an IPv4 CIDR. Hosts answer from the local
+    cache, then from fresh kernel neighbor entries; only the rest are
+    broadcast for, one srp() batch per `chunk` addresses. CIDRs are expanded
+    lazily, chunk by chunk.
+    """
+    fresh_states = frozenset(fresh_states)
+    neighbors: Optional[Dict[str, Dict[str, Any]]] = None
+    results: List[Dict[str, Any]] = []
+    broadcasts = 0
+
+    it = _iter_hosts(hosts)
+    while True:
+        ips = list(islice(it, max(1, chunk)))
+        if not ips:
+            break
+        found: Dict[str, Dict[str, Any]] = {}
+
+        if use_cache:
+            for ip in ips:
+                cached = _cache_get(ip)
+                if cached is not None:
+                    found[ip] = cached
+
+        missing = [ip for ip in ips if ip not in found]
+        if use_neighbors and missing:
+            if neighbors is None:
+                neighbors = read_neighbor_table()
+            warm = _from_neighbors(missing, neighbors, fresh_states)
+            for ip, res in warm.items():
+                found[ip] = res
+                if use_cache:
+                    _cache_put(res, cache_ttl)
+            missing = [ip for ip in missing if ip not in warm]
+
+        if missing:
+            broadcasts += len(missing)
+            requests = [Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=ip) for ip in missing]
+            transport = get_transport()
+            answered, _unanswered = (transport.srp if transport else srp)(
+                requests, timeout=timeout, verbose=0
+            )
+            for sent_pkt, received_pkt in answered:
+                ip = sent_pkt.getlayer(ARP).pdst
+                res = _result(ip)
+                res["rtt_ms"] = round((received_pkt.time - sent_pkt.time) * 1000, 3)
+                res["alive"] = True
+                res["error"] = None
+                if received_pkt.haslayer(ARP):
+                    res["mac"] = received_pkt.getlayer(ARP).hwsrc
+                found[ip] = res
+                if use_cache:
+                    _cache_put(res, cache_ttl)
+
+        results.extend(found.get(ip) or _result(ip) for ip in ips)
+
+    alive = sum(1 for r in results if r["alive"])
+    total = len(results)
+    return {
+        "results": results,
+        "summary": {
+            "alive_count": alive,
+            "total_count": total,
+            "success_rate": round((alive / total * 100.0), 2) if total else 0.0,
+            "broadcast_count": broadcasts,
+        },
+    }
+
+
 # Example usage (must be on the same local network as the target)
 # print(arp_ping("google.com"))
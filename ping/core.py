@@ -1,20 +1,488 @@
 from __future__ import annotations
+import argparse
+import ipaddress
+import os
+import sys
+import time
+from array import array
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from ping.arp import arp_ping, arp_sweep
 from ping.cmd import cmd_ping
 from ping.tcp import tcp_ping
 from ping.udp import udp_ping
 from ping.icmp import icmp_ping
+from ping.export import iter_export
+from ping.results import ResultTable
 
+DEFAULT_PROTOCOLS = ("icmp", "tcp", "udp")
 
-def sweep(host):
-    # print(cmd_ping(host))
-    print(icmp_ping(host))
-    print(tcp_ping(host))
-    print(udp_ping(host))
+
+def _probe(protocol: str, host: str, timeout: float, tcp_port: int, udp_port: int):
+    # Resolve the probe at call time so tests can monkeypatch module names.
+    if protocol == "icmp":
+        return icmp_ping(host, count=1, timeout=timeout)
+    if protocol == "tcp":
+        return tcp_ping(host, port=tcp_port, timeout=timeout)
+    if protocol == "udp":
+        return udp_ping(host, port=udp_port, timeout=timeout)
+    if protocol == "arp":
+        return arp_ping(host, timeout=timeout)
+    raise ValueError(f"unknown protocol: {protocol}")
+
+
+def _run_probe(fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return fn()
+    except Exception as e:
+        return {"alive": False, "rtt_ms": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def sweep_host(
+    host: str,
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    first_alive: bool = True,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Happy-eyeballs liveness check: protocols start `stagger` seconds apart
+    (or as soon as the previous one fails) and, with `first_alive`, the first
+    positive answer wins and the remaining protocols are abandoned.
+
+    Probes run on `executor` when given, so a caller sweeping many hosts
+    bounds every probe, losers included, with one pool. Abandoned probes
+    that haven't started are cancelled; ones already on the wire finish on
+    their own since scapy's calls can't be interrupted.
+    """
+    for proto in protocols:
+        if proto not in ("icmp", "tcp", "udp", "arp"):
+            raise ValueError(f"unknown protocol: {proto}")
+
+    results: Dict[str, Optional[Dict[str, Any]]] = {p: None for p in protocols}
+    out: Dict[str, Any] = {
+        "host": host,
+        "alive": False,
+        "protocol": None,
+        "rtt_ms": None,
+        "elapsed_ms": None,
+        "results": results,
+        "cancelled": [],
+    }
+    if not protocols:
+        out["elapsed_ms"] = 0.0
+        return out
+
+    t0 = time.perf_counter()
+    pool = executor or ThreadPoolExecutor(max_workers=len(protocols))
+    pending: Dict[Any, str] = {}
+    next_idx = 0
+    next_start = t0
+
+    try:
+        while True:
+            now = time.perf_counter()
+            # Launch the next protocol when its stagger slot arrives, or early
+            # when everything launched so far has already failed.
+            if next_idx < len(protocols) and (now >= next_start or not pending):
+                proto = protocols[next_idx]
+                fut = pool.submit(
+                    _run_probe,
+                    lambda p=proto: _probe(p, host, timeout, tcp_port, udp_port),
+                )
+                pending[fut] = proto
+                next_idx += 1
+                next_start = now + stagger
+                continue
+
+            if not pending:
+                break
+
+            wait_for = None
+            if next_idx < len(protocols):
+                wait_for = max(next_start - now, 0.0)
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                proto = pending.pop(fut)
+                res = fut.result()
+                results[proto] = res
+                if res.get("alive") and not out["alive"]:
+                    out["alive"] = True
+                    out["protocol"] = proto
+                    out["rtt_ms"] = res.get("rtt_ms", res.get("avg_response_time"))
+
+            if out["alive"] and first_alive:
+                break
+    finally:
+        for fut in pending:
+            fut.cancel()
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    out["cancelled"] = [p for p in protocols if results[p] is None]
+    out["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+    return out
+
+
+def iter_bounded(
+    fn: Callable[[Any], Any], items: Iterable[Any], max_workers: int
+) -> Iterator[Any]:
+    """
+    Yield fn(item) in completion order with at most `max_workers` calls in
+    flight; `items` is only pulled as slots free up.
+    """
+    it = iter(items)
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+
+        def refill() -> None:
+            for item in islice(it, max_workers - len(pending)):
+                pending.add(pool.submit(fn, item))
+
+        refill()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            refill()
+            for fut in done:
+                yield fut.result()
+
+
+def _check_hosts(hosts: Iterable[str]) -> Iterator[str]:
+    for h in hosts:
+        if not isinstance(h, str):
+            raise TypeError(f"hosts must be strings, got {type(h).__name__}")
+        yield h
+
+
+def iter_sweep(
+    hosts: Iterable[str],
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    first_alive: bool = True,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    max_workers: int = 32,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield sweep_host() results in completion order. At most `max_workers`
+    hosts and `max_workers` probes are in flight, so `hosts` may be an
+    arbitrarily long generator.
+    """
+    protocols = tuple(protocols)
+    max_workers = max(1, max_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as probes:
+
+        def one(h: str) -> Dict[str, Any]:
+            return sweep_host(
+                h,
+                protocols=protocols,
+                timeout=timeout,
+                stagger=stagger,
+                first_alive=first_alive,
+                tcp_port=tcp_port,
+                udp_port=udp_port,
+                executor=probes,
+            )
+
+        yield from iter_bounded(one, _check_hosts(hosts), max_workers)
+
+
+def sweep_hosts(
+    hosts: Iterable[str],
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    first_alive: bool = True,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    max_workers: int = 32,
+    compact: bool = False,
+) -> Union[Dict[str, Any], ResultTable]:
+    # compact=True returns a ResultTable (one row per host, winning protocol)
+    # instead of keeping every per-protocol result dict around: each result
+    # becomes a table row as it completes and rows are put back in input
+    # order at the end.
+    hosts = list(_check_hosts(hosts))
+    max_workers = max(1, max_workers)
+    table = ResultTable() if compact else None
+    rows = array("I", bytes(4 * len(hosts))) if compact else None
+    results: List[Optional[Dict[str, Any]]] = [] if compact else [None] * len(hosts)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as probes:
+
+        def one(item: Tuple[int, str]) -> Tuple[int, Dict[str, Any]]:
+            i, h = item
+            return i, sweep_host(
+                h,
+                protocols=protocols,
+                timeout=timeout,
+                stagger=stagger,
+                first_alive=first_alive,
+                tcp_port=tcp_port,
+                udp_port=udp_port,
+                executor=probes,
+            )
+
+        for i, r in iter_bounded(one, enumerate(hosts), max_workers):
+            if table is not None:
+                rows[i] = table.add_result(r)
+            else:
+                results[i] = r
+
+    if table is not None:
+        table.reorder(rows)
+        return table
+
+    alive = sum(1 for r in results if r["alive"])
+    total = len(hosts)
+    return {
+        "results": results,
+        "summary": {
+            "alive_count": alive,
+            "total_count": total,
+            "success_rate": round((alive / total * 100.0), 2) if total else 0.0,
+        },
+    }
+
+
+def sweep(
+    target: Union[str, Iterable[str]],
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    first_alive: bool = True,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    max_workers: int = 32,
+    compact: bool = False,
+) -> Union[Dict[str, Any], ResultTable]:
+    kwargs = dict(
+        protocols=tuple(protocols),
+        timeout=timeout,
+        stagger=stagger,
+        first_alive=first_alive,
+        tcp_port=tcp_port,
+        udp_port=udp_port,
+    )
+    if isinstance(target, str):
+        return sweep_host(target, **kwargs)
+    if isinstance(target, Iterable):
+        return sweep_hosts(
+            target, max_workers=max_workers, compact=compact, **kwargs
+        )
+    raise TypeError("target must be a string or an iterable of strings")
+
+
+def iter_targets(
+    targets: Iterable[str] = (), files: Iterable[str] = ()
+) -> Iterator[str]:
+    """
+    Yield hosts from arguments and target files ("-" is stdin), one per line,
+    expanding CIDRs lazily. Blank lines and "#" comments are skipped.
+    """
+
+    def lines() -> Iterator[str]:
+        yield from targets
+        for path in files:
+            if path == "-":
+                yield from sys.stdin
+                continue
+            with open(path) as fh:
+                yield from fh
+
+    for line in lines():
+        item = line.split("#", 1)[0].strip()
+        if not item:
+            continue
+        if "/" in item:
+            try:
+                net = ipaddress.ip_network(item, strict=False)
+            except ValueError:
+                yield item
+                continue
+            if net.num_addresses == 1:
+                yield str(net.network_address)
+            else:
+                yield from (str(ip) for ip in net.hosts())
+            continue
+        yield item
+
+
+def _iter_arp(
+    hosts: Iterable[str], timeout: float, chunk: int
+) -> Iterator[Dict[str, Any]]:
+    # ARP is fastest as one broadcast batch per chunk, behind the
+    # neighbor-table fast path and cache.
+    it = iter(hosts)
+    while True:
+        batch = list(islice(it, chunk))
+        if not batch:
+            return
+        yield from arp_sweep(batch, timeout=timeout)["results"]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="ping-cli",
+        description="Stream liveness results for hosts, IPs and CIDRs.",
+    )
+    p.add_argument("targets", nargs="*", help="hosts, IPs or CIDRs")
+    p.add_argument(
+        "-f",
+        "--file",
+        action="append",
+        default=[],
+        help="read targets from a file, one per line ('-' for stdin)",
+    )
+    p.add_argument(
+        "-p",
+        "--protocol",
+        choices=("auto", "icmp", "tcp", "udp", "arp"),
+        default="auto",
+        help="auto races icmp/tcp/udp and stops at the first answer",
+    )
+    p.add_argument("-o", "--format", choices=("ndjson", "csv"), default="ndjson")
+    p.add_argument("-t", "--timeout", type=float, default=1.0)
+    p.add_argument("--port", type=int, default=80, help="TCP port")
+    p.add_argument("--udp-port", type=int, default=53000)
+    p.add_argument("--stagger", type=float, default=0.25)
+    p.add_argument("-j", "--workers", type=int, default=64)
+    p.add_argument(
+        "--batch", type=int, default=64, help="rows per output flush / ARP batch"
+    )
+    p.add_argument("--alive-only", action="store_true")
+    p.add_argument(
+        "--state",
+        metavar="PATH",
+        help="incremental mode: compare with and update this snapshot, "
+        "emit only up/down/rtt changes",
+    )
+    p.add_argument("--retries", type=int, default=2, help="incremental mode only")
+    p.add_argument(
+        "--rtt-threshold",
+        type=float,
+        default=20.0,
+        help="incremental mode: minimum RTT shift to report, in ms",
+    )
+    return p
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if not (1 <= args.port <= 65535 and 1 <= args.udp_port <= 65535):
+        print("ping-cli: ports must be between 1 and 65535", file=sys.stderr)
+        return 2
+
+    files = list(args.file)
+    if not args.targets and not files and not sys.stdin.isatty():
+        files.append("-")
+    hosts = iter_targets(args.targets, files)
+
+    protocols = DEFAULT_PROTOCOLS if args.protocol == "auto" else (args.protocol,)
+    columns = None
+    state: Optional[Dict[str, Any]] = None
+    if args.state:
+        from ping.incremental import (
+            CHANGE_COLUMNS,
+            iter_changes,
+            load_snapshot,
+            save_snapshot,
+        )
+
+        try:
+            previous = load_snapshot(args.state)
+        except (OSError, ValueError) as e:
+            print(f"ping-cli: cannot read state {args.state}: {e}", file=sys.stderr)
+            return 2
+        state = {}
+        stats: Dict[str, int] = {}
+        columns = CHANGE_COLUMNS
+        results = iter_changes(
+            hosts,
+            previous,
+            state,
+            stats=stats,
+            protocols=protocols,
+            retries=args.retries,
+            timeout=args.timeout,
+            stagger=args.stagger,
+            tcp_port=args.port,
+            udp_port=args.udp_port,
+            rtt_abs_ms=args.rtt_threshold,
+            max_workers=args.workers,
+        )
+    elif args.protocol == "arp":
+        results = _iter_arp(hosts, args.timeout, max(args.batch, 1))
+    else:
+        results = iter_sweep(
+            hosts,
+            protocols=protocols,
+            timeout=args.timeout,
+            stagger=args.stagger,
+            first_alive=True,
+            tcp_port=args.port,
+            udp_port=args.udp_port,
+            max_workers=args.workers,
+        )
+
+    seen = {"alive": 0}
+
+    def counted(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for r in rows:
+            if r.get("alive"):
+                seen["alive"] += 1
+            elif args.alive_only:
+                continue
+            yield r
+
+    out = sys.stdout.buffer
+    try:
+        # change events are always emitted in full, "down" included
+        rows = results if state is not None else counted(results)
+        for chunk in iter_export(
+            rows,
+            format=args.format,
+            batch_size=args.batch,
+            columns=columns,
+        ):
+            out.write(chunk)
+            out.flush()
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); not an error. Point stdout
+        # at devnull so the interpreter's final flush doesn't raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    if state is not None:
+        # Only a completed run replaces the previous snapshot.
+        save_snapshot(args.state, state)
+        return 0 if stats["alive"] else 1
+    return 0 if seen["alive"] else 1
 
 
 def main():
-    sweep("google.com")
+    sys.exit(main_cli())
 
 
 if __name__ == "__main__":
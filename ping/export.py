@@ -0,0 +1,259 @@
+from __future__ import annotations
+import csv
+import io
+import json
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ping.results import ResultTable
+
+FORMATS = ("csv", "ndjson", "arrow", "parquet")
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Flat, fixed schema shared by every output format
+COLUMNS = (
+    "host",
+    "resolved_ip",
+    "protocol",
+    "alive",
+    "rtt_ms",
+    "packets_sent",
+    "packets_received",
+    "packet_loss_percent",
+    "icmp_type",
+    "error",
+)
+
+
+def flatten_result(res: Dict[str, Any]) -> Dict[str, Any]:
+    # Normalise any probe/sweep result dict to the COLUMNS schema.
+    rtt = res.get("rtt_ms")
+    if rtt is None:
+        rtt = res.get("avg_response_time")
+    error = res.get("error")
+    if error is None and res.get("errors"):
+        error = res["errors"][-1]
+    sent = res.get("packets_sent")
+    received = res.get("packets_received")
+    loss = res.get("packet_loss_percent")
+    resolved_ip = res.get("resolved_ip")
+    icmp_type = res.get("icmp_type")
+    if sent is None and "results" in res:
+        # sweep_host(): one logical probe per host. Address and ICMP type
+        # live in the per-protocol dicts, the winning probe's first.
+        sent, received = 1, 1 if res.get("alive") else 0
+        loss = 0.0 if res.get("alive") else 100.0
+        probes = [r for r in res["results"].values() if r]
+        winner = res["results"].get(res.get("protocol"))
+        if winner:
+            probes.insert(0, winner)
+        if resolved_ip is None:
+            resolved_ip = next(
+                (r["resolved_ip"] for r in probes if r.get("resolved_ip")), None
+            )
+        if icmp_type is None and winner:
+            icmp_type = winner.get("icmp_type")
+        if error is None and not res.get("alive"):
+            errors = [r.get("error") or (r.get("errors") or [None])[-1] for r in probes]
+            error = next((e for e in errors if e), None)
+    return {
+        "host": res.get("host"),
+        "resolved_ip": resolved_ip,
+        "protocol": res.get("protocol"),
+        "alive": bool(res.get("alive")),
+        "rtt_ms": None if rtt is None else float(rtt),
+        "packets_sent": sent,
+        "packets_received": received,
+        "packet_loss_percent": None if loss is None else float(loss),
+        "icmp_type": icmp_type,
+        "error": None if error is None else str(error),
+    }
+
+
+def _rows(
+    results: Union[ResultTable, Iterable[Dict[str, Any]]], flatten: bool = True
+) -> Iterator[Dict[str, Any]]:
+    if not flatten:
+        yield from results
+        return
+    if isinstance(results, ResultTable):
+        for rec in results:
+            yield flatten_result(rec.to_dict())
+        return
+    for res in results:
+        yield flatten_result(res)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained by the caller."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "Arrow/Parquet export requires pyarrow (pip install scan-ping[export])"
+        ) from e
+    return pa, pa.schema(
+        [
+            ("host", pa.string()),
+            ("resolved_ip", pa.string()),
+            ("protocol", pa.string()),
+            ("alive", pa.bool_()),
+            ("rtt_ms", pa.float32()),
+            ("packets_sent", pa.uint16()),
+            ("packets_received", pa.uint16()),
+            ("packet_loss_percent", pa.float32()),
+            ("icmp_type", pa.int16()),
+            ("error", pa.string()),
+        ]
+    )
+
+
+def _batches(
+    rows: Iterator[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_export(
+    results: Union[ResultTable, Iterable[Dict[str, Any]]],
+    format: str = "csv",
+    batch_size: int = 1024,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Encode results incrementally and yield byte chunks. Only one batch of
+    `batch_size` rows (one Arrow record batch / Parquet row group) is held in
+    memory at a time, so `results` can be a live sweep generator.
+
+    With `columns`, rows are written as-is instead of being flattened to
+    COLUMNS (csv/ndjson only).
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if columns is not None and format not in ("csv", "ndjson"):
+        raise ValueError("custom columns are only supported for csv and ndjson")
+    batch_size = max(1, batch_size)
+    rows = _rows(results, flatten=columns is None)
+
+    if format == "csv":
+        buf = io.StringIO()
+        writer = csv.DictWriter(
+            buf,
+            fieldnames=columns or COLUMNS,
+            lineterminator="\n",
+            extrasaction="ignore",
+        )
+        writer.writeheader()
+        for batch in _batches(rows, batch_size):
+            writer.writerows(batch)
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode()
+        return
+
+    if format == "ndjson":
+        for batch in _batches(rows, batch_size):
+            yield "".join(json.dumps(r) + "\n" for r in batch).encode()
+        return
+
+    pa, schema = _arrow_schema()
+    sink = _ChunkSink()
+    if format == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    else:
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in _batches(rows, batch_size):
+            cols = {name: [r[name] for r in batch] for name in COLUMNS}
+            table = pa.Table.from_pydict(cols, schema=schema)
+            if format == "arrow":
+                writer.write_table(table)
+            else:
+                writer.write_table(table, row_group_size=len(batch))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def export_results(
+    results: Union[ResultTable, Iterable[Dict[str, Any]]],
+    dest: Union[str, BinaryIO],
+    format: Optional[str] = None,
+    batch_size: int = 1024,
+) -> int:
+    """
+    Stream results to a path or binary file object. The format defaults to
+    the file extension; ValueError if it has none we know. Returns the
+    number of bytes written.
+    """
+    if format is None:
+        name = dest if isinstance(dest, str) else getattr(dest, "name", "")
+        ext = str(name).rsplit(".", 1)[-1].lower() if "." in str(name) else ""
+        aliases = {"jsonl": "ndjson", "arrows": "arrow", "pq": "parquet"}
+        format = aliases.get(ext, ext)
+        if format not in FORMATS:
+            raise ValueError(
+                f"cannot infer export format from {name!r}; pass format= "
+                f"(one of {', '.join(FORMATS)})"
+            )
+
+    written = 0
+    if isinstance(dest, str):
+        with open(dest, "wb") as fh:
+            for chunk in iter_export(results, format=format, batch_size=batch_size):
+                fh.write(chunk)
+                written += len(chunk)
+    else:
+        for chunk in iter_export(results, format=format, batch_size=batch_size):
+            dest.write(chunk)
+            written += len(chunk)
+    return written
@@ -1,9 +1,12 @@
 from __future__ import annotations
 import os, time, socket, random, statistics
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from scapy.all import conf, sr1, IP, ICMP, Raw, IPv6, ICMPv6EchoRequest
 
+from ping.results import ResultTable
+from ping.transport import get_transport
+
 
 def _resolve(host: str) -> Tuple[str, int]:
     # Return (ip, family). family = socket.AF_INET or socket.AF_INET6
@@ -46,18 +49,28 @@ def ping_once(
     ttl: int = 64,
     df: bool = False,
     payload: bytes = b"payload",
+    keep_raw: bool = False,
+    keep_packet: bool = False,
 ) -> Dict[str, Any]:
     # Send one echo request and return a result dict.
+    # keep_raw adds the (expensive) repr of the reply under "raw";
+    # keep_packet hands the reply itself back under "packet" so a
+    # ResultTable can repr it later, only if anyone asks.
     ip, fam = _resolve(host)
     ident = (os.getpid() & 0xFFFF) ^ random.randint(0, 0xFFFF)
     seq = random.randint(0, 0xFFFF)
     pkt = _icmp_packet(ip, fam, ident, seq, ttl, df, payload)
 
     t0 = time.perf_counter()
-    ans = sr1(pkt, timeout=timeout, verbose=0)
+    transport = get_transport()
+    ans = (transport.sr1 if transport else sr1)(pkt, timeout=timeout, verbose=0)
     t1 = time.perf_counter()
 
-    rtt_ms = round((t1 - t0) * 1000.0, 3)
+    if transport is not None and ans is not None:
+        # Replayed/recorded traffic carries its own timing
+        rtt_ms = round((ans.time - pkt.sent_time) * 1000.0, 3)
+    else:
+        rtt_ms = round((t1 - t0) * 1000.0, 3)
 
     result: Dict[str, Any] = {
         "host": host,
@@ -105,7 +118,10 @@ def ping_once(
         result["min_response_time"] = rtt_ms
         result["avg_response_time"] = rtt_ms
         result["max_response_time"] = rtt_ms
-        result["raw"] = repr(ans)
+        if keep_raw:
+            result["raw"] = repr(ans)
+        if keep_packet:
+            result["packet"] = ans
     except Exception as e:
         result["error"] = f"parse error: {e}"
 
@@ -121,21 +137,34 @@ def icmp_ping(
     ttl: int = 64,
     df: bool = False,
     payload: bytes = b"payload",
+    keep_packet: bool = False,
 ) -> Dict[str, Any]:
     """
-    Multi-echo with stats, Scapy-based.
+    Multi-echo with stats, Scapy-based. "icmp_type" is the type of the last
+    reply. With `keep_packet`, that reply is returned under "packet".
     """
     rtts: List[float] = []
     resolved_ip, _fam = _resolve(host)
     received = 0
     errors: List[str] = []
+    icmp_type = None
+    packet = None
 
     for seq in range(count):
         res = ping_once(
-            host, timeout=timeout, iface=iface, ttl=ttl, df=df, payload=payload
+            host,
+            timeout=timeout,
+            iface=iface,
+            ttl=ttl,
+            df=df,
+            payload=payload,
+            keep_packet=keep_packet,
         )
+        if res.get("packet") is not None:
+            packet = res["packet"]
         if res["packets_received"]:
             received += 1
+            icmp_type = res["icmp_type"]
             if res["rtt_ms"] is not None:
                 rtts.append(res["rtt_ms"])
         if res.get("error"):
@@ -154,8 +183,11 @@ def icmp_ping(
         "min_response_time": min(rtts) if rtts else None,
         "avg_response_time": round(statistics.fmean(rtts), 3) if rtts else None,
         "max_response_time": max(rtts) if rtts else None,
+        "icmp_type": icmp_type,
         "errors": errors,
     }
+    if keep_packet:
+        out["packet"] = packet
     return out
 
 
@@ -168,11 +200,17 @@ def ping_many_icmp(
     ttl: int = 64,
     df: bool = False,
     payload: bytes = b"payload",
-) -> Dict[str, Any]:
+    compact: bool = False,
+    keep_packets: bool = False,
+) -> Union[Dict[str, Any], ResultTable]:
+    # compact=True returns a ResultTable; call .to_dict() for the JSON shape.
+    # keep_packets=True (compact only) stores each host's last reply in the
+    # table, repr'd only when .raw / include_raw asks for it.
+    table = ResultTable(keep_packets=keep_packets) if compact else None
     results = []
     alive = 0
     for h in hosts:
-        r = ping_icmp(
+        r = icmp_ping(
             h,
             count=count,
             timeout=timeout,
@@ -181,10 +219,16 @@ def ping_many_icmp(
             ttl=ttl,
             df=df,
             payload=payload,
+            keep_packet=table is not None and keep_packets,
         )
+        if table is not None:
+            table.add_result(r, packet=r.pop("packet", None))
+            continue
         results.append(r)
         if r["alive"]:
             alive += 1
+    if table is not None:
+        return table
     total = len(hosts)
     return {
         "results": results,
@@ -0,0 +1,247 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ping.core import DEFAULT_PROTOCOLS, iter_bounded, sweep_host
+
+SNAPSHOT_VERSION = 1
+
+CHANGE_COLUMNS = (
+    "host",
+    "change",
+    "alive",
+    "protocol",
+    "rtt_ms",
+    "prev_rtt_ms",
+    "attempts",
+)
+
+# host -> {"alive": bool, "protocol": str | None, "rtt_ms": float | None, "ts": float}
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """Load a snapshot written by save_snapshot(); a missing file is empty."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version: {data.get('version')}")
+    return {
+        host: {"alive": bool(alive), "protocol": proto, "rtt_ms": rtt, "ts": ts}
+        for host, (alive, proto, rtt, ts) in data["hosts"].items()
+    }
+
+
+def save_snapshot(path: str, snapshot: Snapshot) -> None:
+    # Rows are stored as positional lists in gzip'd JSON and the file is
+    # swapped in atomically, so a crashed run never leaves a torn snapshot.
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time(),
+        "hosts": {
+            host: [s["alive"], s.get("protocol"), s.get("rtt_ms"), s.get("ts")]
+            for host, s in snapshot.items()
+        },
+    }
+    tmp = f"{path}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _rtt_shifted(
+    prev: Optional[float], cur: Optional[float], abs_ms: float, rel: float
+) -> bool:
+    if prev is None or cur is None:
+        return False
+    return abs(cur - prev) > max(abs_ms, rel * prev)
+
+
+def _check(
+    host: str,
+    prev: Optional[Dict[str, Any]],
+    protocols: Sequence[str],
+    retries: int,
+    timeout: float,
+    stagger: float,
+    tcp_port: int,
+    udp_port: int,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    attempts = 0
+    res: Dict[str, Any] = {"alive": False}
+
+    # Known-alive host: one probe with the protocol that answered last time.
+    if prev and prev["alive"] and prev.get("protocol") in protocols:
+        attempts += 1
+        res = sweep_host(
+            host,
+            protocols=(prev["protocol"],),
+            timeout=timeout,
+            tcp_port=tcp_port,
+            udp_port=udp_port,
+            executor=executor,
+        )
+        if res["alive"]:
+            return dict(res, attempts=attempts, cheap=True)
+
+    # Changed, previously dead or new: full effort with retries.
+    for _ in range(1 + max(retries, 0)):
+        attempts += 1
+        res = sweep_host(
+            host,
+            protocols=protocols,
+            timeout=timeout,
+            stagger=stagger,
+            tcp_port=tcp_port,
+            udp_port=udp_port,
+            executor=executor,
+        )
+        if res["alive"]:
+            break
+    return dict(res, attempts=attempts, cheap=False)
+
+
+def iter_changes(
+    hosts: Iterable[str],
+    previous: Snapshot,
+    current: Snapshot,
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    retries: int = 2,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    rtt_abs_ms: float = 20.0,
+    rtt_rel: float = 0.5,
+    max_workers: int = 32,
+    stats: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Re-sweep `hosts` against `previous` and yield only transitions: "up",
+    "down" and "rtt" when the RTT moved by more than max(rtt_abs_ms,
+    rtt_rel * baseline). `current` is filled with the new state; a host's
+    RTT baseline is only replaced when a shift is reported, so slow drift
+    still trips the threshold eventually. Like iter_sweep(), at most
+    `max_workers` hosts and `max_workers` probes are in flight.
+
+    Once `hosts` is exhausted, entries of `previous` that weren't probed are
+    copied into `current` unchanged, so re-sweeping part of a fleet keeps
+    the state of the rest.
+    """
+    protocols = tuple(protocols)
+    if stats is None:
+        stats = {}
+    for key in ("probed", "alive", "cheap", "full", "up", "down", "rtt", "unchanged"):
+        stats.setdefault(key, 0)
+
+    def handle(res: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        host = res["host"]
+        prev = previous.get(host)
+        was_alive = bool(prev and prev["alive"])
+        rtt = res.get("rtt_ms")
+        prev_rtt = prev.get("rtt_ms") if prev else None
+
+        stats["probed"] += 1
+        stats["alive"] += bool(res["alive"])
+        stats["cheap" if res["cheap"] else "full"] += 1
+
+        change = None
+        if res["alive"] and not was_alive:
+            change = "up"
+        elif was_alive and not res["alive"]:
+            change = "down"
+        elif res["alive"] and _rtt_shifted(prev_rtt, rtt, rtt_abs_ms, rtt_rel):
+            change = "rtt"
+
+        baseline = rtt if (change or prev_rtt is None) else prev_rtt
+        current[host] = {
+            "alive": bool(res["alive"]),
+            "protocol": res.get("protocol") or (prev or {}).get("protocol"),
+            "rtt_ms": baseline if res["alive"] else None,
+            "ts": time.time(),
+        }
+
+        if change is None:
+            stats["unchanged"] += 1
+            return None
+        stats[change] += 1
+        return {
+            "host": host,
+            "change": change,
+            "alive": bool(res["alive"]),
+            "protocol": res.get("protocol"),
+            "rtt_ms": rtt,
+            "prev_rtt_ms": prev_rtt,
+            "attempts": res["attempts"],
+        }
+
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as probes:
+
+        def one(h: str) -> Dict[str, Any]:
+            res = _check(
+                h,
+                previous.get(h),
+                protocols,
+                retries,
+                timeout,
+                stagger,
+                tcp_port,
+                udp_port,
+                executor=probes,
+            )
+            res["host"] = h
+            return res
+
+        for res in iter_bounded(one, hosts, max_workers):
+            event = handle(res)
+            if event is not None:
+                yield event
+
+    for host, prev in previous.items():
+        current.setdefault(host, prev)
+
+
+def incremental_sweep(
+    hosts: Iterable[str],
+    snapshot_path: str,
+    protocols: Sequence[str] = DEFAULT_PROTOCOLS,
+    retries: int = 2,
+    timeout: float = 1.0,
+    stagger: float = 0.25,
+    tcp_port: int = 80,
+    udp_port: int = 53000,
+    rtt_abs_ms: float = 20.0,
+    rtt_rel: float = 0.5,
+    max_workers: int = 32,
+) -> Dict[str, Any]:
+    previous = load_snapshot(snapshot_path)
+    current: Snapshot = {}
+    stats: Dict[str, int] = {}
+    changes: List[Dict[str, Any]] = list(
+        iter_changes(
+            hosts,
+            previous,
+            current,
+            protocols=protocols,
+            retries=retries,
+            timeout=timeout,
+            stagger=stagger,
+            tcp_port=tcp_port,
+            udp_port=udp_port,
+            rtt_abs_ms=rtt_abs_ms,
+            rtt_rel=rtt_rel,
+            max_workers=max_workers,
+            stats=stats,
+        )
+    )
+    save_snapshot(snapshot_path, current)
+    return {"changes": changes, "summary": stats}
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import os, time, socket, random
+from typing import Any, Dict, List, Optional, Tuple
+
+from scapy.all import sr, ICMP, ICMPv6EchoReply, ICMPv6PacketTooBig
+
+from ping.icmp import _resolve, _icmp_packet
+from ping.transport import get_transport
+
+# IP + ICMP header overhead added on top of the echo payload
+_HEADER_V4 = 20 + 8
+_HEADER_V6 = 40 + 8
+
+# Smallest MTU every link must carry (RFC 791 / RFC 8200)
+_MIN_MTU_V4 = 68
+_MIN_MTU_V6 = 1280
+
+# resolved ip -> (mtu, search ceiling, expires_at)
+_PMTU_CACHE: Dict[str, Tuple[int, int, float]] = {}
+
+
+def clear_pmtu_cache() -> None:
+    _PMTU_CACHE.clear()
+
+
+def _cache_get(ip: str, max_mtu: int) -> Optional[int]:
+    entry = _PMTU_CACHE.get(ip)
+    if entry is None:
+        return None
+    mtu, ceiling, expires = entry
+    if time.monotonic() >= expires:
+        _PMTU_CACHE.pop(ip, None)
+        return None
+    # mtu == ceiling only says "at least ceiling"; it can't answer a search
+    # with a higher cap.
+    if mtu >= ceiling and ceiling < max_mtu:
+        return None
+    return min(mtu, max_mtu)
+
+
+def _cache_put(ip: str, mtu: int, ceiling: int, ttl: float) -> None:
+    if ttl > 0:
+        _PMTU_CACHE[ip] = (mtu, ceiling, time.monotonic() + ttl)
+
+
+def _probe_sizes(lo: int, hi: int, width: int) -> List[int]:
+    # Evenly spread `width` MTU candidates over (lo, hi], always including hi.
+    span = hi - lo
+    if span <= 0:
+        return []
+    width = max(1, min(width, span))
+    sizes = {lo + (span * i) // width for i in range(1, width + 1)}
+    sizes.discard(lo)
+    return sorted(sizes)
+
+
+def _classify(reply) -> Tuple[str, Optional[int]]:
+    # Return ("ok" | "too_big" | "other", next-hop mtu hint)
+    if reply.haslayer(ICMPv6PacketTooBig):
+        return "too_big", getattr(reply.getlayer(ICMPv6PacketTooBig), "mtu", None)
+    if reply.haslayer(ICMP):
+        icmp = reply.getlayer(ICMP)
+        if icmp.type == 0:
+            return "ok", None
+        if icmp.type == 3 and icmp.code == 4:
+            hint = getattr(icmp, "nexthopmtu", None)
+            return "too_big", hint or None
+        return "other", None
+    if reply.haslayer(ICMPv6EchoReply):
+        return "ok", None
+    return "other", None
+
+
+def pmtu_discover(
+    host: str,
+    timeout: float = 1.0,
+    max_mtu: int = 1500,
+    min_mtu: Optional[int] = None,
+    width: int = 8,
+    max_rounds: int = 5,
+    ttl: int = 64,
+    iface: Optional[str] = None,
+    cache_ttl: float = 600.0,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Path-MTU discovery: probes `width` DF echo sizes in parallel per round and
+    narrows the (lo, hi] window on echo replies and frag-needed/packet-too-big.
+    """
+    ip, fam = _resolve(host)
+    v6 = fam == socket.AF_INET6 or ":" in ip
+    header = _HEADER_V6 if v6 else _HEADER_V4
+    floor = min_mtu if min_mtu is not None else (_MIN_MTU_V6 if v6 else _MIN_MTU_V4)
+
+    result: Dict[str, Any] = {
+        "host": host,
+        "resolved_ip": ip,
+        "mtu": None,
+        "cached": False,
+        "rounds": 0,
+        "probes_sent": 0,
+        "too_big_replies": 0,
+        "error": None,
+    }
+
+    if use_cache:
+        cached = _cache_get(ip, max_mtu)
+        if cached is not None:
+            result["mtu"] = cached
+            result["cached"] = True
+            return result
+
+    ident = (os.getpid() & 0xFFFF) ^ random.randint(0, 0xFFFF)
+    seq = random.randint(0, 0xFFFF)
+
+    # Invariant: `lo` is the largest size known to pass (or floor - 1 when
+    # nothing has passed yet), `hi` is the largest size that may still pass.
+    lo = floor - 1
+    hi = max_mtu
+    confirmed = False
+
+    while lo < hi and result["rounds"] < max_rounds:
+        sizes = _probe_sizes(lo, hi, width)
+        if not sizes:
+            break
+        result["rounds"] += 1
+
+        pkts = []
+        for size in sizes:
+            seq = (seq + 1) & 0xFFFF
+            payload = b"\x00" * max(size - header, 0)
+            pkts.append(_icmp_packet(ip, fam, ident, seq, ttl, True, payload))
+        result["probes_sent"] += len(pkts)
+
+        transport = get_transport()
+        send = transport.sr if transport else sr
+        answered, unanswered = send(pkts, timeout=timeout, iface=iface, verbose=0)
+        answered = list(answered)
+        if unanswered:
+            # One lost echo must not shrink the window: silent sizes get a
+            # second chance before they count against `hi`.
+            result["probes_sent"] += len(unanswered)
+            again, _unanswered = send(
+                list(unanswered), timeout=timeout, iface=iface, verbose=0
+            )
+            answered.extend(again)
+
+        passed: List[int] = []
+        hints: List[int] = []
+        for sent, reply in answered:
+            size = len(sent)
+            kind, hint = _classify(reply)
+            if kind == "ok":
+                passed.append(size)
+            elif kind == "too_big":
+                result["too_big_replies"] += 1
+                if hint:
+                    hints.append(int(hint))
+
+        if passed:
+            lo = max(lo, max(passed))
+            confirmed = True
+        # Anything larger than the smallest silent/rejected probe is suspect;
+        # silence twice in a row above `lo` is treated as a black hole.
+        failed = [s for s in sizes if s > lo and s not in passed]
+        if failed:
+            hi = min(hi, min(failed) - 1)
+        for h in hints:
+            if lo < h <= hi:
+                hi = h
+        hi = max(hi, lo)
+
+    if not confirmed:
+        result["error"] = "no reply to any probe size"
+        return result
+
+    result["mtu"] = lo
+    if lo < hi:
+        result["error"] = f"search incomplete, mtu between {lo} and {hi}"
+    else:
+        _cache_put(ip, lo, max_mtu, cache_ttl)
+    return result
+
+
+# Example usage
+# print(pmtu_discover("8.8.8.8"))
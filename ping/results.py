@@ -0,0 +1,318 @@
+from __future__ import annotations
+import math
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Row flag bits
+ALIVE = 0x01
+REPLIED = 0x02
+
+# Which optional keys a row's source dict carried, so row_dict() gives back
+# the same shape that went in.
+_F_IP = 0x01  # resolved_ip
+_F_COUNTS = 0x02  # packets_sent / packets_received / packet_loss_percent
+_F_STATS = 0x04  # min/avg/max_response_time
+_F_RTT = 0x08  # rtt_ms
+_F_ICMP = 0x10  # icmp_type
+_F_PROTOCOL = 0x20  # protocol
+_F_ERROR = 0x40  # error
+_F_ERRORS = 0x80  # errors (list)
+
+# Rows added with add() directly
+_F_DEFAULT = _F_IP | _F_COUNTS | _F_STATS | _F_RTT | _F_ICMP | _F_ERROR
+
+_NAN = float("nan")
+
+
+class ProbeRecord:
+    """
+    Lightweight view of one row in a ResultTable; holds no data of its own.
+    """
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "ResultTable", i: int):
+        self._table = table
+        self._i = i
+
+    @property
+    def host(self) -> Optional[str]:
+        return self._table._str(self._table._host[self._i])
+
+    @property
+    def resolved_ip(self) -> Optional[str]:
+        return self._table._str(self._table._ip[self._i])
+
+    @property
+    def protocol(self) -> Optional[str]:
+        return self._table._str(self._table._protocol[self._i])
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._table._str(self._table._error[self._i])
+
+    @property
+    def errors(self) -> List[str]:
+        return self._table.errors(self._i)
+
+    @property
+    def alive(self) -> bool:
+        return bool(self._table._flags[self._i] & ALIVE)
+
+    @property
+    def rtt_ms(self) -> Optional[float]:
+        return _rtt(self._table._rtt_avg[self._i])
+
+    @property
+    def icmp_type(self) -> Optional[int]:
+        t = self._table._icmp_type[self._i]
+        return None if t < 0 else t
+
+    @property
+    def raw(self) -> str:
+        return self._table.raw(self._i)
+
+    def to_dict(self, include_raw: bool = False) -> Dict[str, Any]:
+        return self._table.row_dict(self._i, include_raw=include_raw)
+
+    def __repr__(self) -> str:
+        return f"ProbeRecord({self.to_dict()!r})"
+
+
+def _f32(value: Optional[float]) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _rtt(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(value, 3)
+
+
+class ResultTable:
+    """
+    Columnar store for large sweeps. Strings (hosts, IPs, errors) are interned
+    once, numbers live in typed arrays (RTTs as float32) and reply packets are
+    only kept, and repr'd, when asked for. Rows added with add_result() come
+    back from to_dict() with the same keys, full error lists included.
+    """
+
+    # Per-row typed arrays, in the order reorder() permutes them
+    _COLUMNS = (
+        "_host",
+        "_ip",
+        "_protocol",
+        "_error",
+        "_flags",
+        "_icmp_type",
+        "_sent",
+        "_received",
+        "_rtt_min",
+        "_rtt_avg",
+        "_rtt_max",
+        "_shape",
+    )
+
+    def __init__(self, keep_packets: bool = False):
+        self.keep_packets = keep_packets
+        # index 0 is reserved for None
+        self._strings: List[Optional[str]] = [None]
+        self._string_idx: Dict[str, int] = {}
+        self._host = array("I")
+        self._ip = array("I")
+        self._protocol = array("I")
+        self._error = array("I")
+        self._flags = array("B")
+        self._icmp_type = array("h")
+        self._sent = array("H")
+        self._received = array("H")
+        self._rtt_min = array("f")
+        self._rtt_avg = array("f")
+        self._rtt_max = array("f")
+        self._shape = array("B")
+        # every error of row i is _error_ids[_error_off[i]:_error_off[i + 1]]
+        self._error_off = array("I", [0])
+        self._error_ids = array("I")
+        self._packets: Dict[int, Any] = {}
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        idx = self._string_idx.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings.append(value)
+            self._string_idx[value] = idx
+        return idx
+
+    def _str(self, idx: int) -> Optional[str]:
+        return self._strings[idx]
+
+    def add(
+        self,
+        host: str,
+        alive: bool,
+        resolved_ip: Optional[str] = None,
+        rtt_ms: Optional[float] = None,
+        min_rtt: Optional[float] = None,
+        max_rtt: Optional[float] = None,
+        packets_sent: int = 1,
+        packets_received: Optional[int] = None,
+        icmp_type: Optional[int] = None,
+        protocol: Optional[str] = None,
+        error: Optional[str] = None,
+        packet: Any = None,
+        errors: Sequence[str] = (),
+    ) -> int:
+        if packets_received is None:
+            packets_received = 1 if rtt_ms is not None else 0
+        flags = (ALIVE if alive else 0) | (REPLIED if packets_received else 0)
+
+        i = len(self._flags)
+        self._host.append(self._intern(host))
+        self._ip.append(self._intern(resolved_ip))
+        self._protocol.append(self._intern(protocol))
+        self._error.append(self._intern(error))
+        self._flags.append(flags)
+        self._icmp_type.append(-1 if icmp_type is None else int(icmp_type))
+        self._sent.append(min(int(packets_sent), 0xFFFF))
+        self._received.append(min(int(packets_received), 0xFFFF))
+        self._rtt_avg.append(_f32(rtt_ms))
+        self._rtt_min.append(_f32(min_rtt if min_rtt is not None else rtt_ms))
+        self._rtt_max.append(_f32(max_rtt if max_rtt is not None else rtt_ms))
+        self._shape.append(_F_DEFAULT | (_F_PROTOCOL if protocol is not None else 0))
+        self._error_ids.extend(self._intern(e) for e in errors)
+        self._error_off.append(len(self._error_ids))
+        if packet is not None and self.keep_packets:
+            self._packets[i] = packet
+        return i
+
+    def add_result(self, res: Dict[str, Any], packet: Any = None) -> int:
+        # Accepts the dict shapes returned by ping_once/icmp_ping/tcp_ping/
+        # udp_ping/arp_ping/sweep_host; to_dict() gives the same keys back
+        # (minus sweep_host's per-protocol "results").
+        rtt = res.get("rtt_ms")
+        if rtt is None:
+            rtt = res.get("avg_response_time")
+        errors = res.get("errors") or ()
+        error = res.get("error")
+        if error is None and errors:
+            error = errors[-1]
+        i = self.add(
+            host=res.get("host"),
+            alive=bool(res.get("alive")),
+            resolved_ip=res.get("resolved_ip"),
+            rtt_ms=rtt,
+            min_rtt=res.get("min_response_time"),
+            max_rtt=res.get("max_response_time"),
+            packets_sent=res.get("packets_sent", 1),
+            packets_received=res.get("packets_received"),
+            icmp_type=res.get("icmp_type"),
+            protocol=res.get("protocol"),
+            error=error,
+            packet=packet,
+            errors=errors,
+        )
+        shape = 0
+        for key, bit in (
+            ("resolved_ip", _F_IP),
+            ("packets_sent", _F_COUNTS),
+            ("avg_response_time", _F_STATS),
+            ("rtt_ms", _F_RTT),
+            ("icmp_type", _F_ICMP),
+            ("protocol", _F_PROTOCOL),
+            ("error", _F_ERROR),
+            ("errors", _F_ERRORS),
+        ):
+            if key in res:
+                shape |= bit
+        self._shape[i] = shape
+        return i
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __getitem__(self, i: int) -> ProbeRecord:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return ProbeRecord(self, i)
+
+    def __iter__(self) -> Iterator[ProbeRecord]:
+        for i in range(len(self)):
+            yield ProbeRecord(self, i)
+
+    def reorder(self, order: Sequence[int]) -> None:
+        """Rearrange rows in place so that row k becomes old row order[k]."""
+        if sorted(order) != list(range(len(self))):
+            raise ValueError("order must be a permutation of the row indices")
+        for name in self._COLUMNS:
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, (col[j] for j in order)))
+        ids = array("I")
+        off = array("I", [0])
+        for j in order:
+            ids.extend(self._error_ids[self._error_off[j] : self._error_off[j + 1]])
+            off.append(len(ids))
+        self._error_ids, self._error_off = ids, off
+        where = {old: new for new, old in enumerate(order)}
+        self._packets = {where[i]: pkt for i, pkt in self._packets.items()}
+
+    def errors(self, i: int) -> List[str]:
+        ids = self._error_ids[self._error_off[i] : self._error_off[i + 1]]
+        return [self._strings[k] for k in ids]
+
+    def raw(self, i: int) -> str:
+        pkt = self._packets.get(i)
+        return "" if pkt is None else repr(pkt)
+
+    @property
+    def alive_count(self) -> int:
+        return sum(1 for f in self._flags if f & ALIVE)
+
+    def row_dict(self, i: int, include_raw: bool = False) -> Dict[str, Any]:
+        shape = self._shape[i]
+        row: Dict[str, Any] = {"host": self._str(self._host[i])}
+        if shape & _F_IP:
+            row["resolved_ip"] = self._str(self._ip[i])
+        row["alive"] = bool(self._flags[i] & ALIVE)
+        if shape & _F_COUNTS:
+            sent = self._sent[i]
+            received = self._received[i]
+            row["packets_sent"] = sent
+            row["packets_received"] = received
+            row["packet_loss_percent"] = (
+                round(100.0 * (sent - received) / sent, 2) if sent else 100.0
+            )
+        if shape & _F_STATS:
+            row["min_response_time"] = _rtt(self._rtt_min[i])
+            row["avg_response_time"] = _rtt(self._rtt_avg[i])
+            row["max_response_time"] = _rtt(self._rtt_max[i])
+        if shape & _F_RTT:
+            row["rtt_ms"] = _rtt(self._rtt_avg[i])
+        if shape & _F_ICMP:
+            row["icmp_type"] = None if self._icmp_type[i] < 0 else self._icmp_type[i]
+        if shape & _F_PROTOCOL:
+            row["protocol"] = self._str(self._protocol[i])
+        if shape & _F_ERROR:
+            row["error"] = self._str(self._error[i])
+        if shape & _F_ERRORS:
+            row["errors"] = self.errors(i)
+        if include_raw:
+            row["raw"] = self.raw(i)
+        return row
+
+    def summary(self) -> Dict[str, Any]:
+        total = len(self)
+        alive = self.alive_count
+        return {
+            "alive_count": alive,
+            "total_count": total,
+            "success_rate": round((alive / total * 100.0), 2) if total else 0.0,
+        }
+
+    def to_dict(self, include_raw: bool = False) -> Dict[str, Any]:
+        # ping_many_icmp(compact=True).to_dict() == ping_many_icmp().
+        return {
+            "results": [self.row_dict(i, include_raw) for i in range(len(self))],
+            "summary": self.summary(),
+        }
@@ -1,5 +1,7 @@
 from scapy.all import IP, TCP, sr1
 
+from ping.transport import get_transport
+
 
 def tcp_ping(host: str, port: int = 80, timeout: float = 5.0) -> dict:
     """
@@ -9,7 +11,10 @@ def tcp_ping(host: str, port: int = 80, timeout: float = 5.0) -> dict:
     pkt = IP(dst=host) / TCP(dport=port, flags="S")
 
     # Send the packet and wait for a single response
-    response = sr1(pkt, timeout=timeout, verbose=0)
+    transport = get_transport()
+    response = (transport.sr1 if transport else sr1)(
+        pkt, timeout=timeout, verbose=0
+    )
 
     result = {
         "host": host,
@@ -0,0 +1,297 @@
+from __future__ import annotations
+import abc
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from scapy.all import (
+    ARP,
+    ICMP,
+    IP,
+    TCP,
+    UDP,
+    Ether,
+    ICMPerror,
+    ICMPv6EchoRequest,
+    IPerror,
+    IPerror6,
+    IPv6,
+    PcapWriter,
+    TCPerror,
+    UDPerror,
+    rdpcap,
+)
+
+# L3 packets are framed in a dummy Ethernet header so IP and ARP exchanges
+# can share one DLT_EN10MB capture file.
+_ZERO_MAC = "00:00:00:00:00:00"
+
+# How far back replay looks for the request a captured packet answers
+_MATCH_WINDOW = 256
+
+_active: Optional["Transport"] = None
+
+
+def get_transport() -> Optional["Transport"]:
+    # None means "use scapy directly" (the default, live behaviour).
+    return _active
+
+
+def set_transport(transport: Optional["Transport"]) -> Optional["Transport"]:
+    global _active
+    previous, _active = _active, transport
+    return previous
+
+
+@contextmanager
+def use_transport(transport: Optional["Transport"]) -> Iterator[Optional["Transport"]]:
+    previous = set_transport(transport)
+    try:
+        yield transport
+    finally:
+        set_transport(previous)
+        if transport is not None:
+            transport.close()
+
+
+class Transport(abc.ABC):
+    """
+    Send/receive layer under the probe functions. Mirrors the subset of the
+    scapy API they use: sr1 / sr at L3 and srp at L2.
+    """
+
+    def sr1(self, pkt, timeout: float = 1.0, **kwargs):
+        answered, _unanswered = self.sr(pkt, timeout=timeout, **kwargs)
+        return answered[0][1] if answered else None
+
+    @abc.abstractmethod
+    def sr(
+        self, pkts, timeout: float = 1.0, **kwargs
+    ) -> Tuple[List[Tuple[Any, Any]], List[Any]]:
+        ...
+
+    @abc.abstractmethod
+    def srp(
+        self, pkts, timeout: float = 1.0, **kwargs
+    ) -> Tuple[List[Tuple[Any, Any]], List[Any]]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class LiveTransport(Transport):
+    """Raw sockets via scapy; needs root like the probes always have."""
+
+    def sr1(self, pkt, timeout: float = 1.0, **kwargs):
+        from scapy.all import sr1
+
+        return sr1(pkt, timeout=timeout, **kwargs)
+
+    def sr(self, pkts, timeout: float = 1.0, **kwargs):
+        from scapy.all import sr
+
+        answered, unanswered = sr(pkts, timeout=timeout, **kwargs)
+        return list(answered), list(unanswered)
+
+    def srp(self, pkts, timeout: float = 1.0, **kwargs):
+        from scapy.all import srp
+
+        answered, unanswered = srp(pkts, timeout=timeout, **kwargs)
+        return list(answered), list(unanswered)
+
+
+def _frame(pkt, ts: Optional[float]):
+    frame = (
+        pkt.copy() if pkt.haslayer(Ether) else Ether(src=_ZERO_MAC, dst=_ZERO_MAC) / pkt
+    )
+    if ts is not None:
+        frame.time = ts
+    return frame
+
+
+class RecordingTransport(Transport):
+    """
+    Pass traffic through `inner` and append every request, followed by its
+    reply if any, to a pcap file with the original timestamps.
+    """
+
+    def __init__(
+        self, path: str, inner: Optional[Transport] = None, append: bool = False
+    ):
+        self.path = path
+        self.inner = inner if inner is not None else LiveTransport()
+        self._writer = PcapWriter(path, append=append, sync=True)
+        self._lock = threading.Lock()
+
+    def _record(self, answered, unanswered) -> None:
+        exchanges = [(s, r) for s, r in answered] + [(s, None) for s in unanswered]
+        exchanges.sort(
+            key=lambda e: float(getattr(e[0], "sent_time", None) or e[0].time)
+        )
+        with self._lock:
+            for sent, reply in exchanges:
+                self._writer.write(
+                    _frame(sent, getattr(sent, "sent_time", None) or sent.time)
+                )
+                if reply is not None:
+                    self._writer.write(_frame(reply, reply.time))
+
+    def sr1(self, pkt, timeout: float = 1.0, **kwargs):
+        reply = self.inner.sr1(pkt, timeout=timeout, **kwargs)
+        if reply is None:
+            self._record([], [pkt])
+        else:
+            self._record([(pkt, reply)], [])
+        return reply
+
+    def sr(self, pkts, timeout: float = 1.0, **kwargs):
+        answered, unanswered = self.inner.sr(pkts, timeout=timeout, **kwargs)
+        self._record(answered, unanswered)
+        return answered, unanswered
+
+    def srp(self, pkts, timeout: float = 1.0, **kwargs):
+        answered, unanswered = self.inner.srp(pkts, timeout=timeout, **kwargs)
+        self._record(answered, unanswered)
+        return answered, unanswered
+
+    def close(self) -> None:
+        with self._lock:
+            self._writer.close()
+
+
+def _request_key(pkt) -> Hashable:
+    # What a replayed request has to agree on with the recorded one: the
+    # protocol, destination and port/ICMP type. Echo payload size is part of
+    # the key so PMTU probes of different sizes keep their own answers.
+    if pkt.haslayer(ARP):
+        return ("arp", pkt[ARP].op, pkt[ARP].pdst)
+    for l3 in (IP, IPv6):
+        if pkt.haslayer(l3):
+            ip = pkt[l3]
+            l4 = ip.payload
+            if isinstance(l4, (TCP, UDP)):
+                return (l4.name, ip.dst, l4.dport)
+            if isinstance(l4, (ICMP, ICMPv6EchoRequest)):
+                return (l4.name, ip.dst, l4.type, len(bytes(l4.payload)))
+            return (l4.name, ip.dst)
+    return (pkt.lastlayer().name,)
+
+
+def _rebind(reply, rec_sent, pkt):
+    # Rewrite the per-run fields (source address, ports, ICMP id/seq, TCP
+    # ack) of a recorded reply so it answers `pkt` instead of `rec_sent`.
+    reply = reply.copy()
+    src = pkt[IP].src if pkt.haslayer(IP) else None
+    if src is None and pkt.haslayer(IPv6):
+        src = pkt[IPv6].src
+    for layer in reply.iterpayloads():
+        if isinstance(layer, (IPerror, IPerror6)):
+            layer.src = src
+        elif isinstance(layer, (IP, IPv6)):
+            layer.dst = src
+        elif isinstance(layer, TCPerror):
+            layer.sport, layer.seq = pkt[TCP].sport, pkt[TCP].seq
+        elif isinstance(layer, TCP):
+            offset = (layer.ack - rec_sent[TCP].seq) & 0xFFFFFFFF
+            layer.dport = pkt[TCP].sport
+            layer.ack = (pkt[TCP].seq + offset) & 0xFFFFFFFF
+        elif isinstance(layer, UDPerror):
+            layer.sport = pkt[UDP].sport
+        elif isinstance(layer, UDP):
+            layer.dport = pkt[UDP].sport
+        elif isinstance(layer, (ICMP, ICMPerror)) and layer.type in (0, 8):
+            layer.id, layer.seq = pkt[ICMP].id, pkt[ICMP].seq
+        elif isinstance(layer, ICMPv6EchoRequest):
+            req = pkt[ICMPv6EchoRequest]
+            layer.id, layer.seq = req.id, req.seq
+        else:
+            continue
+        for field in ("chksum", "cksum"):
+            if field in layer.fields:
+                delattr(layer, field)
+    return reply
+
+
+class ReplayTransport(Transport):
+    """
+    Feed a recorded pcap back to the probes. Each packet sent is matched to
+    the oldest unused recorded exchange with the same protocol, destination
+    and port/ICMP type, and the recorded reply is rewritten to answer it.
+    Packets with nothing left to match come back unanswered, so concurrent
+    sweeps replay the same way regardless of thread scheduling.
+
+    `speed` scales the recorded RTTs: 1.0 replays in real time, 10.0 ten
+    times faster and 0 (the default) without waiting at all. Reply
+    timestamps are rebased so packet-time RTTs match the recording.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0):
+        self.path = path
+        self.speed = speed
+        self.exchanges = self._load(path)
+        self._unused: Dict[Hashable, Deque[Tuple[Any, Optional[Any]]]] = (
+            defaultdict(deque)
+        )
+        for ex in self.exchanges:
+            self._unused[_request_key(ex[0])].append(ex)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(path: str) -> List[Tuple[Any, Optional[Any]]]:
+        exchanges: List[List[Any]] = []
+        for frame in rdpcap(path):
+            for ex in reversed(exchanges[-_MATCH_WINDOW:]):
+                if ex[1] is None and frame.answers(ex[0]):
+                    ex[1] = frame
+                    break
+            else:
+                exchanges.append([frame, None])
+        return [(s, r) for s, r in exchanges]
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._unused.values())
+
+    def _match(self, pkt) -> Tuple[Any, Optional[Any]]:
+        with self._lock:
+            queue = self._unused.get(_request_key(pkt))
+            if not queue:
+                return None, None
+            return queue.popleft()
+
+    def _exchange(self, pkts, timeout: float, l2: bool):
+        pkts = [pkts] if not isinstance(pkts, (list, tuple)) else list(pkts)
+        answered, unanswered, delay = [], [], 0.0
+        now = time.time()
+        for pkt in pkts:
+            rec_sent, rec_reply = self._match(pkt)
+            pkt.sent_time = pkt.time = now
+            reply = None
+            if rec_reply is not None:
+                reply = _rebind(rec_reply, rec_sent, pkt)
+                if not l2 and not pkt.haslayer(Ether):
+                    reply = reply.payload
+                if not reply.answers(pkt):
+                    reply = None
+            if reply is None:
+                # the recorded call sat out its full timeout
+                unanswered.append(pkt)
+                delay = max(delay, timeout)
+                continue
+            rtt = max(float(rec_reply.time - rec_sent.time), 0.0)
+            reply.time = now + rtt
+            answered.append((pkt, reply))
+            delay = max(delay, rtt)
+        if self.speed and delay:
+            time.sleep(delay / self.speed)
+        return answered, unanswered
+
+    def sr(self, pkts, timeout: float = 1.0, **kwargs):
+        return self._exchange(pkts, timeout, l2=False)
+
+    def srp(self, pkts, timeout: float = 1.0, **kwargs):
+        return self._exchange(pkts, timeout, l2=True)
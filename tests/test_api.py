@@ -0,0 +1,61 @@
+# tests/test_api.py
+import json
+
+import pytest
+
+pytest.importorskip("scapy.all")
+api = pytest.importorskip("ping.api")
+
+from ping import core
+
+
+@pytest.fixture
+def client(monkeypatch):
+    probed = []
+
+    def probe(host, **_k):
+        probed.append(host)
+        return {"host": host, "alive": True, "rtt_ms": 1.0}
+
+    for proto in ("icmp", "tcp", "udp", "arp"):
+        monkeypatch.setattr(core, f"{proto}_ping", probe)
+    c = api.app.test_client()
+    c.probed = probed
+    return c
+
+
+@pytest.mark.parametrize("fmt", ["", "&format=ndjson"])
+@pytest.mark.parametrize(
+    "host,protocols",
+    [
+        ("10.0.0.0/8", "arp"),
+        ("10.0.0.0/8", "icmp"),
+        ("10.0.0.0/16,10.1.0.0/30", "icmp"),
+        ("2001:db8::/64", "icmp"),
+        ("2001:db8::/120", "arp"),
+        ("2001:db8::1", "arp"),
+        ("10.0.0.0/33", "icmp"),
+    ],
+)
+def test_sweep_rejects_oversized_targets(client, fmt, host, protocols):
+    res = client.get(f"/api/ping/sweep?host={host}&protocols={protocols}{fmt}")
+    assert res.status_code == 400
+    assert "error" in res.get_json()
+    assert client.probed == []
+
+
+def test_sweep_expands_cidrs_on_both_paths(client):
+    res = client.get("/api/ping/sweep?host=10.0.0.0/30&protocols=icmp")
+    assert res.status_code == 200
+    hosts = [r["host"] for r in res.get_json()["results"]]
+    assert hosts == ["10.0.0.1", "10.0.0.2"]
+
+    res = client.get("/api/ping/sweep?host=10.0.0.0/30,a&protocols=icmp&format=ndjson")
+    assert res.status_code == 200
+    rows = [json.loads(x) for x in res.get_data(as_text=True).splitlines()]
+    assert sorted(r["host"] for r in rows) == ["10.0.0.1", "10.0.0.2", "a"]
+
+
+def test_sweep_single_host_keeps_host_shape(client):
+    res = client.get("/api/ping/sweep?host=a&protocols=icmp").get_json()
+    assert res["host"] == "a" and res["protocol"] == "icmp"
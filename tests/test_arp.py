@@ -0,0 +1,162 @@
+# tests/test_arp.py
+import pytest
+
+pytest.importorskip("scapy.all")
+
+from scapy.all import ARP, Ether
+
+from ping import arp as arp_mod
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    arp_mod.clear_arp_cache()
+    yield
+    arp_mod.clear_arp_cache()
+
+
+def _fake_srp(alive_ips, calls):
+    def fake_srp(pkts, **_k):
+        pkts = pkts if isinstance(pkts, list) else [pkts]
+        calls.append([p[ARP].pdst for p in pkts])
+        answered = []
+        for p in pkts:
+            if p[ARP].pdst in alive_ips:
+                reply = Ether() / ARP(op=2, psrc=p[ARP].pdst, hwsrc="02:00:00:00:00:01")
+                reply.time = p.time + 0.001
+                answered.append((p, reply))
+        return answered, []
+
+    return fake_srp
+
+
+def test_parse_ip_neigh_json():
+    table = arp_mod._parse_ip_neigh_json(
+        '[{"dst":"10.0.0.1","dev":"eth0","lladdr":"aa:bb:cc:dd:ee:ff",'
+        '"state":["REACHABLE"]},{"dst":"10.0.0.2","dev":"eth0","state":["FAILED"]}]'
+    )
+    assert table["10.0.0.1"] == {
+        "mac": "aa:bb:cc:dd:ee:ff",
+        "iface": "eth0",
+        "state": "REACHABLE",
+    }
+    assert table["10.0.0.2"]["state"] == "FAILED"
+
+
+def test_parse_proc_arp():
+    text = (
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "10.0.0.1         0x1         0x2         aa:bb:cc:dd:ee:ff     *        eth0\n"
+        "10.0.0.3         0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+    )
+    table = arp_mod._parse_proc_arp(text)
+    assert table["10.0.0.1"]["state"] == "COMPLETE"
+    assert table["10.0.0.3"]["state"] == "INCOMPLETE"
+    # no NUD state in /proc: complete entries may be stale
+    assert "COMPLETE" not in arp_mod.FRESH_STATES
+
+
+def test_arp_sweep_uses_neighbors_then_cache(monkeypatch):
+    monkeypatch.setattr(
+        arp_mod,
+        "read_neighbor_table",
+        lambda: {
+            "10.0.0.1": {
+                "mac": "aa:aa:aa:aa:aa:01",
+                "iface": "eth0",
+                "state": "REACHABLE",
+            },
+            "10.0.0.2": {"mac": "aa:aa:aa:aa:aa:02", "iface": "eth0", "state": "STALE"},
+        },
+    )
+    calls = []
+    monkeypatch.setattr(arp_mod, "srp", _fake_srp({"10.0.0.2"}, calls))
+
+    res = arp_mod.arp_sweep("10.0.0.0/30")
+    by_ip = {r["host"]: r for r in res["results"]}
+    assert by_ip["10.0.0.1"]["source"] == "neighbor"
+    assert by_ip["10.0.0.1"]["mac"] == "aa:aa:aa:aa:aa:01"
+    # stale entries are re-verified on the wire, in one batch
+    assert calls == [["10.0.0.2"]]
+    assert by_ip["10.0.0.2"]["alive"] is True
+    assert by_ip["10.0.0.2"]["source"] == "arp"
+    assert res["summary"]["alive_count"] == 2
+    assert res["summary"]["broadcast_count"] == 1
+
+    # second sweep: alive hosts come from the cache, only the dead one is retried
+    monkeypatch.setattr(arp_mod, "read_neighbor_table", lambda: {})
+    again = arp_mod.arp_sweep(["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+    assert [r["source"] for r in again["results"]] == ["cache", "cache", "arp"]
+    assert calls == [["10.0.0.2"], ["10.0.0.3"]]
+    assert again["summary"]["broadcast_count"] == 1
+
+
+def test_arp_ping_default_always_broadcasts(monkeypatch):
+    calls = []
+    monkeypatch.setattr(arp_mod, "srp", _fake_srp({"10.0.0.9"}, calls))
+    assert arp_mod.arp_ping("10.0.0.9")["alive"] is True
+    assert arp_mod.arp_ping("10.0.0.9")["alive"] is True
+    assert len(calls) == 2
+
+    cached = arp_mod.arp_ping("10.0.0.9", use_cache=True)
+    assert cached["source"] == "arp"
+    assert arp_mod.arp_ping("10.0.0.9", use_cache=True)["source"] == "cache"
+    assert len(calls) == 3
+
+
+def test_proc_fallback_entries_are_reverified(monkeypatch):
+    # /proc reports STALE entries as complete; a host that left hours ago
+    # must not come back alive from the neighbor table.
+    text = (
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "10.0.0.1         0x1         0x2         aa:bb:cc:dd:ee:ff     *        eth0\n"
+        "10.0.0.2         0x1         0x6         aa:bb:cc:dd:ee:02     *        eth0\n"
+    )
+    monkeypatch.setattr(
+        arp_mod, "read_neighbor_table", lambda: arp_mod._parse_proc_arp(text)
+    )
+    calls = []
+    monkeypatch.setattr(arp_mod, "srp", _fake_srp(set(), calls))
+    res = arp_mod.arp_sweep(["10.0.0.1", "10.0.0.2"])
+    by_ip = {r["host"]: r for r in res["results"]}
+    assert calls == [["10.0.0.1"]]
+    assert by_ip["10.0.0.1"]["alive"] is False
+    assert by_ip["10.0.0.2"]["source"] == "neighbor"
+    assert "10.0.0.1" not in arp_mod._ARP_CACHE
+
+
+def test_arp_ping_neighbors_respects_use_cache(monkeypatch):
+    monkeypatch.setattr(
+        arp_mod,
+        "read_neighbor_table",
+        lambda: {"10.0.0.5": {"mac": "aa:aa:aa:aa:aa:05", "state": "REACHABLE"}},
+    )
+    res = arp_mod.arp_ping("10.0.0.5", use_neighbors=True)
+    assert res["source"] == "neighbor"
+    assert arp_mod._ARP_CACHE == {}
+
+
+def test_arp_sweep_broadcasts_in_chunks(monkeypatch):
+    calls = []
+    monkeypatch.setattr(arp_mod, "srp", _fake_srp({"10.0.0.7"}, calls))
+    res = arp_mod.arp_sweep("10.0.0.0/28", use_neighbors=False, chunk=5)
+    assert [len(c) for c in calls] == [5, 5, 4]
+    assert res["summary"]["total_count"] == 14
+    assert res["summary"]["alive_count"] == 1
+
+    with pytest.raises(ValueError):
+        arp_mod.arp_sweep("2001:db8::/120")
+
+
+def test_arp_sweep_route_limits(monkeypatch):
+    api = pytest.importorskip("ping.api")
+    monkeypatch.setattr(
+        api, "arp_sweep", lambda cidr, **_k: {"results": [], "cidr": cidr}
+    )
+    client = api.app.test_client()
+    assert client.get("/api/ping/arp/sweep?cidr=10.0.0.0/8").status_code == 400
+    assert client.get("/api/ping/arp/sweep?cidr=2001:db8::/120").status_code == 400
+    assert client.get("/api/ping/arp/sweep?cidr=nope").status_code == 400
+    ok = client.get("/api/ping/arp/sweep?cidr=10.0.0.5/24")
+    assert ok.status_code == 200
+    assert ok.get_json()["cidr"] == "10.0.0.0/24"
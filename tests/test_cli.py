@@ -0,0 +1,57 @@
+# tests/test_cli.py
+import io
+import json
+
+import pytest
+
+pytest.importorskip("scapy.all")
+
+from ping import core
+
+
+def test_iter_targets_expands_and_skips(tmp_path):
+    path = tmp_path / "targets.txt"
+    path.write_text("# fleet\nexample.com\n\n10.0.0.0/30  # lab\n")
+    hosts = list(core.iter_targets(["192.0.2.5", "192.0.2.9/32"], [str(path)]))
+    assert hosts == [
+        "192.0.2.5",
+        "192.0.2.9",
+        "example.com",
+        "10.0.0.1",
+        "10.0.0.2",
+    ]
+
+
+def test_iter_targets_is_lazy():
+    it = core.iter_targets(["10.0.0.0/8"])
+    assert next(it) == "10.0.0.1"
+
+
+def test_main_cli_streams_ndjson(monkeypatch, capsysbinary):
+    monkeypatch.setattr(
+        core,
+        "tcp_ping",
+        lambda host, **_k: {"host": host, "alive": host != "10.0.0.2", "rtt_ms": 1.0},
+    )
+    code = core.main_cli(["-p", "tcp", "--port", "22", "10.0.0.0/30"])
+    assert code == 0
+    rows = [json.loads(line) for line in capsysbinary.readouterr().out.splitlines()]
+    assert sorted(r["host"] for r in rows) == ["10.0.0.1", "10.0.0.2"]
+    assert {r["host"]: r["alive"] for r in rows}["10.0.0.2"] is False
+
+
+def test_main_cli_stdin_csv_alive_only(monkeypatch, capsysbinary):
+    monkeypatch.setattr(core.sys, "stdin", io.StringIO("a.example\nb.example\n"))
+    monkeypatch.setattr(
+        core, "icmp_ping", lambda host, **_k: {"alive": host == "a.example"}
+    )
+    code = core.main_cli(["-p", "icmp", "-o", "csv", "--alive-only"])
+    assert code == 0
+    lines = capsysbinary.readouterr().out.decode().splitlines()
+    assert lines[0].startswith("host,")
+    assert len(lines) == 2 and lines[1].startswith("a.example,")
+
+
+def test_main_cli_exit_code_when_nothing_alive(monkeypatch, capsysbinary):
+    monkeypatch.setattr(core, "icmp_ping", lambda host, **_k: {"alive": False})
+    assert core.main_cli(["-p", "icmp", "down.example"]) == 1
@@ -0,0 +1,125 @@
+# tests/test_export.py
+import csv
+import io
+import json
+
+import pytest
+
+from ping.export import export_results, iter_export
+from ping.results import ResultTable
+
+
+def _results(n):
+    for i in range(n):
+        yield {
+            "host": f"h{i}",
+            "resolved_ip": f"10.0.0.{i % 250}",
+            "alive": i % 2 == 0,
+            "rtt_ms": 1.5 if i % 2 == 0 else None,
+            "error": None if i % 2 == 0 else "No response",
+        }
+
+
+def test_csv_streams_in_batches():
+    chunks = list(iter_export(_results(10), format="csv", batch_size=4))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert len(rows) == 10
+    assert rows[0]["host"] == "h0" and rows[0]["alive"] == "True"
+    assert rows[1]["error"] == "No response"
+
+
+def test_csv_header_only_when_empty():
+    out = b"".join(iter_export([], format="csv"))
+    assert out.decode().strip().startswith("host,resolved_ip")
+
+
+def test_ndjson_from_result_table():
+    table = ResultTable()
+    for r in _results(3):
+        table.add_result(r)
+    buf = io.BytesIO()
+    export_results(table, buf, format="ndjson")
+    lines = buf.getvalue().decode().splitlines()
+    assert [json.loads(line)["host"] for line in lines] == ["h0", "h1", "h2"]
+
+
+def test_export_consumes_lazily():
+    seen = []
+
+    def gen():
+        for r in _results(10):
+            seen.append(r["host"])
+            yield r
+
+    it = iter_export(gen(), format="ndjson", batch_size=2)
+    next(it)
+    assert len(seen) == 2
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        list(iter_export([], format="xml"))
+
+
+def test_parquet_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "sweep.parquet"
+    export_results(_results(25), str(path), batch_size=10)
+    pf = pq.ParquetFile(str(path))
+    assert pf.metadata.num_rows == 25
+    assert pf.num_row_groups == 3
+    assert pf.read().column("host").to_pylist()[-1] == "h24"
+
+
+def test_arrow_stream(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    buf = io.BytesIO()
+    export_results(_results(7), buf, format="arrow", batch_size=3)
+    table = pa.ipc.open_stream(buf.getvalue()).read_all()
+    assert table.num_rows == 7
+    assert table.column("alive").to_pylist()[:2] == [True, False]
+
+
+def test_export_requires_known_format(tmp_path):
+    for name in ("results.txt", "results"):
+        with pytest.raises(ValueError):
+            export_results(_results(1), str(tmp_path / name))
+        assert not (tmp_path / name).exists()
+    with pytest.raises(ValueError):
+        export_results(_results(1), io.BytesIO())
+    # an explicit format still wins over the name
+    assert export_results(_results(1), str(tmp_path / "out.txt"), format="csv")
+
+
+def test_flatten_sweep_host_takes_probe_fields(monkeypatch):
+    pytest.importorskip("scapy.all")
+    from scapy.all import ICMP, IP
+
+    from ping import core, icmp
+
+    monkeypatch.setattr(
+        icmp,
+        "_resolve",
+        lambda host: ("203.0.113.5", __import__("socket").AF_INET),
+    )
+    monkeypatch.setattr(icmp, "sr1", lambda *a, **k: IP() / ICMP(type=0))
+    monkeypatch.setattr(icmp.time, "sleep", lambda *_: None)
+    monkeypatch.setattr(
+        core, "tcp_ping", lambda host, **_k: {"host": host, "alive": False}
+    )
+
+    res = core.sweep_host("up.example", protocols=("icmp", "tcp"), stagger=0.0)
+    assert res["protocol"] == "icmp"
+    row = json.loads(b"".join(iter_export([res], format="ndjson")))
+    assert row["resolved_ip"] == "203.0.113.5"
+    assert row["icmp_type"] == 0
+    assert row["protocol"] == "icmp"
+
+    monkeypatch.setattr(icmp, "sr1", lambda *a, **k: None)
+    res = core.sweep_host("down.example", protocols=("icmp",))
+    row = json.loads(b"".join(iter_export([res], format="ndjson")))
+    assert row["alive"] is False
+    assert row["resolved_ip"] == "203.0.113.5"
+    assert row["icmp_type"] is None
+    assert row["error"] == "timeout/no reply"
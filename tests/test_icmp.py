@@ -93,3 +93,58 @@ def test_ping_many_icmp(monkeypatch):
     )
     assert res["summary"]["alive_count"] == 2
     assert res["summary"]["total_count"] == 2
+
+
+def test_ping_many_icmp_compact(monkeypatch):
+    _fake_dns(monkeypatch)
+    monkeypatch.setattr(ping_icmp_mod, "sr1", lambda *a, **k: _fake_sr1_reply(0))
+    monkeypatch.setattr(ping_icmp_mod.time, "sleep", lambda *_: None)
+
+    table = ping_icmp_mod.ping_many_icmp(
+        ["a.example", "b.example"], count=2, timeout=0.05, compact=True
+    )
+    assert len(table) == 2
+    assert table[0].alive is True
+    res = table.to_dict()
+    assert res["summary"]["alive_count"] == 2
+    assert res["results"][1]["host"] == "b.example"
+    assert res["results"][1]["packets_received"] == 2
+
+
+def test_ping_many_icmp_keeps_packets_lazily(monkeypatch):
+    _fake_dns(monkeypatch)
+    reprs = []
+
+    class CountingPkt(type(_fake_sr1_reply())):
+        def __repr__(self):
+            reprs.append(1)
+            return "<CountingPkt>"
+
+    monkeypatch.setattr(ping_icmp_mod, "sr1", lambda *a, **k: CountingPkt(0))
+    monkeypatch.setattr(ping_icmp_mod.time, "sleep", lambda *_: None)
+
+    assert ping_icmp_mod.ping_once("a.example")["raw"] == ""
+    table = ping_icmp_mod.ping_many_icmp(
+        ["a.example", "b.example"], count=2, compact=True, keep_packets=True
+    )
+    assert reprs == []
+    assert table[1].raw == "<CountingPkt>"
+    assert len(reprs) == 1
+    assert "packet" not in table.to_dict()["results"][0]
+
+
+def test_ping_many_icmp_compact_matches_dicts(monkeypatch):
+    _fake_dns(monkeypatch)
+    replies = iter([_fake_sr1_reply(0), None] * 4)
+    monkeypatch.setattr(ping_icmp_mod, "sr1", lambda *a, **k: next(replies))
+    monkeypatch.setattr(ping_icmp_mod.time, "sleep", lambda *_: None)
+    ticks = iter(i * 0.0125 for i in range(100))
+    monkeypatch.setattr(ping_icmp_mod.time, "perf_counter", lambda: next(ticks))
+
+    hosts = ["a.example", "b.example"]
+    table = ping_icmp_mod.ping_many_icmp(hosts, count=2, compact=True)
+    replies = iter([_fake_sr1_reply(0), None] * 4)
+    ticks = iter(i * 0.0125 for i in range(100))
+    plain = ping_icmp_mod.ping_many_icmp(hosts, count=2)
+    assert plain["results"][0]["errors"] == ["timeout/no reply"]
+    assert table.to_dict() == plain
@@ -0,0 +1,138 @@
+# tests/test_incremental.py
+import json
+
+import pytest
+
+pytest.importorskip("scapy.all")
+
+from ping import core, incremental
+
+
+def _network(monkeypatch, alive, rtts=None, calls=None):
+    """Fake icmp/tcp/udp: hosts in `alive` answer on every protocol."""
+    rtts = rtts or {}
+
+    def make(proto):
+        def probe(host, **_k):
+            if calls is not None:
+                calls.append((proto, host))
+            up = host in alive
+            return {
+                "host": host,
+                "alive": up,
+                "rtt_ms": rtts.get(host, 5.0) if up else None,
+            }
+
+        return probe
+
+    for proto in ("icmp", "tcp", "udp"):
+        monkeypatch.setattr(core, f"{proto}_ping", make(proto))
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    assert incremental.load_snapshot(path) == {}
+    snap = {"a": {"alive": True, "protocol": "tcp", "rtt_ms": 1.5, "ts": 10.0}}
+    incremental.save_snapshot(path, snap)
+    assert incremental.load_snapshot(path) == snap
+
+
+def test_incremental_emits_only_diff(monkeypatch, tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    hosts = ["a", "b", "c", "d"]
+
+    _network(monkeypatch, alive={"a", "b", "c"})
+    first = incremental.incremental_sweep(hosts, path, retries=0, stagger=0.0)
+    assert sorted(c["host"] for c in first["changes"]) == ["a", "b", "c"]
+    assert all(c["change"] == "up" for c in first["changes"])
+
+    # b goes down, d comes up, c slows down a lot, a is unchanged
+    calls = []
+    _network(monkeypatch, alive={"a", "c", "d"}, rtts={"c": 80.0}, calls=calls)
+    second = incremental.incremental_sweep(hosts, path, retries=1, stagger=0.0)
+    by_host = {c["host"]: c for c in second["changes"]}
+    assert set(by_host) == {"b", "c", "d"}
+    assert by_host["b"]["change"] == "down"
+    assert by_host["d"]["change"] == "up"
+    assert by_host["c"]["change"] == "rtt"
+    assert by_host["c"]["prev_rtt_ms"] == 5.0
+
+    # unchanged alive host cost exactly one probe
+    protocol = incremental.load_snapshot(path)["a"]["protocol"]
+    assert [c for c in calls if c[1] == "a"] == [(protocol, "a")]
+    # the host that went down got the cheap probe plus full retries
+    assert by_host["b"]["attempts"] == 3
+    assert second["summary"]["cheap"] == 2
+    assert second["summary"]["unchanged"] == 1
+
+    snap = incremental.load_snapshot(path)
+    assert snap["b"]["alive"] is False
+    assert snap["c"]["rtt_ms"] == 80.0
+
+
+def test_rtt_baseline_kept_until_shift(monkeypatch, tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    for rtt in (10.0, 25.0, 40.0):
+        _network(monkeypatch, alive={"a"}, rtts={"a": rtt})
+        res = incremental.incremental_sweep(["a"], path, rtt_abs_ms=20.0, rtt_rel=0.0)
+    # 10 -> 25 is within threshold, 10 -> 40 is not
+    assert [c["change"] for c in res["changes"]] == ["rtt"]
+    assert incremental.load_snapshot(path)["a"]["rtt_ms"] == 40.0
+
+
+def test_subset_sweep_keeps_other_hosts(monkeypatch, tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    _network(monkeypatch, alive={"a", "b", "c"})
+    incremental.incremental_sweep(["a", "b", "c"], path, retries=0, stagger=0.0)
+
+    # only part of the fleet this time; b went down
+    _network(monkeypatch, alive={"a"})
+    part = incremental.incremental_sweep(["a", "b"], path, retries=0, stagger=0.0)
+    assert [c["host"] for c in part["changes"]] == ["b"]
+    snap = incremental.load_snapshot(path)
+    assert set(snap) == {"a", "b", "c"}
+    assert snap["c"]["alive"] is True
+
+    # the next full run doesn't report c as newly up
+    _network(monkeypatch, alive={"a", "c"})
+    full = incremental.incremental_sweep(["a", "b", "c"], path, retries=0, stagger=0.0)
+    assert full["changes"] == []
+
+
+def test_changes_share_one_probe_pool(monkeypatch):
+    executors = set()
+    real = incremental.sweep_host
+
+    def tracked(host, **kw):
+        executors.add(id(kw.get("executor")))
+        return real(host, **kw)
+
+    _network(monkeypatch, alive={"a", "c"})
+    monkeypatch.setattr(incremental, "sweep_host", tracked)
+    list(
+        incremental.iter_changes(
+            ["a", "b", "c", "d"], {}, {}, retries=1, stagger=0.0, max_workers=2
+        )
+    )
+    assert len(executors) == 1 and id(None) not in executors
+
+
+def test_cli_state_mode(monkeypatch, tmp_path, capsysbinary):
+    path = str(tmp_path / "state.json.gz")
+    _network(monkeypatch, alive={"10.0.0.1"})
+    assert core.main_cli(["--state", path, "--retries", "0", "10.0.0.0/30"]) == 0
+    rows = [json.loads(x) for x in capsysbinary.readouterr().out.splitlines()]
+    assert rows == [
+        {
+            "host": "10.0.0.1",
+            "change": "up",
+            "alive": True,
+            "protocol": "icmp",
+            "rtt_ms": 5.0,
+            "prev_rtt_ms": None,
+            "attempts": 1,
+        }
+    ]
+
+    assert core.main_cli(["--state", path, "--retries", "0", "10.0.0.0/30"]) == 0
+    assert capsysbinary.readouterr().out == b""
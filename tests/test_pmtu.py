@@ -0,0 +1,134 @@
+# tests/test_pmtu.py
+import pytest
+import socket
+
+# Skip whole file if scapy isn't available
+pytest.importorskip("scapy.all")
+
+from scapy.all import IP, ICMP
+
+from ping import pmtu as pmtu_mod
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    pmtu_mod.clear_pmtu_cache()
+    yield
+    pmtu_mod.clear_pmtu_cache()
+
+
+def _fake_dns(monkeypatch, ip="203.0.113.10"):
+    monkeypatch.setattr(
+        pmtu_mod.socket,
+        "getaddrinfo",
+        lambda host, *_a, **_k: [(socket.AF_INET, None, None, None, (ip, 0))],
+    )
+
+
+def _fake_path(path_mtu, hint=True, calls=None):
+    """sr() replacement: echo-reply up to path_mtu, frag-needed above it."""
+
+    def fake_sr(pkts, **_k):
+        if calls is not None:
+            calls.append([len(p) for p in pkts])
+        answered = []
+        for p in pkts:
+            if len(p) <= path_mtu:
+                answered.append((p, IP() / ICMP(type=0)))
+            elif hint:
+                answered.append(
+                    (p, IP() / ICMP(type=3, code=4, nexthopmtu=path_mtu))
+                )
+        return answered, []
+
+    return fake_sr
+
+
+def test_pmtu_uses_frag_needed_hint(monkeypatch):
+    _fake_dns(monkeypatch)
+    calls = []
+    monkeypatch.setattr(pmtu_mod, "sr", _fake_path(1400, calls=calls))
+
+    res = pmtu_mod.pmtu_discover("vpn.example", timeout=0.01)
+    assert res["mtu"] == 1400
+    assert res["error"] is None
+    assert res["too_big_replies"] > 0
+    # hint is verified on the second round, no further search needed
+    assert res["rounds"] == 2
+    # first round probes several sizes at once
+    assert len(calls[0]) > 1
+
+
+def test_pmtu_black_hole_binary_search(monkeypatch):
+    _fake_dns(monkeypatch)
+    monkeypatch.setattr(pmtu_mod, "sr", _fake_path(1372, hint=False))
+
+    res = pmtu_mod.pmtu_discover("blackhole.example", timeout=0.01)
+    assert res["mtu"] == 1372
+    assert res["too_big_replies"] == 0
+    assert res["rounds"] <= 5
+
+
+def test_pmtu_cache_and_ttl(monkeypatch):
+    _fake_dns(monkeypatch)
+    calls = []
+    monkeypatch.setattr(pmtu_mod, "sr", _fake_path(1500, calls=calls))
+
+    first = pmtu_mod.pmtu_discover("ok.example", timeout=0.01)
+    sent = len(calls)
+    second = pmtu_mod.pmtu_discover("ok.example", timeout=0.01)
+    assert first["mtu"] == second["mtu"] == 1500
+    assert second["cached"] is True
+    assert len(calls) == sent
+
+    # expire the entry
+    pmtu_mod._PMTU_CACHE["203.0.113.10"] = (1500, 1500, 0.0)
+    third = pmtu_mod.pmtu_discover("ok.example", timeout=0.01)
+    assert third["cached"] is False
+    assert len(calls) > sent
+
+
+def test_pmtu_no_reply(monkeypatch):
+    _fake_dns(monkeypatch)
+    monkeypatch.setattr(pmtu_mod, "sr", lambda pkts, **_k: ([], pkts))
+
+    res = pmtu_mod.pmtu_discover("down.example", timeout=0.01)
+    assert res["mtu"] is None
+    assert res["error"]
+
+
+def test_pmtu_capped_result_not_served_for_higher_cap(monkeypatch):
+    _fake_dns(monkeypatch)
+    monkeypatch.setattr(pmtu_mod, "sr", _fake_path(9000))
+
+    capped = pmtu_mod.pmtu_discover("jumbo.example", timeout=0.01, max_mtu=1400)
+    assert capped["mtu"] == 1400
+    full = pmtu_mod.pmtu_discover("jumbo.example", timeout=0.01, max_mtu=9000)
+    assert full["cached"] is False
+    assert full["mtu"] == 9000
+    # a search with a higher cap answers a lower one
+    again = pmtu_mod.pmtu_discover("jumbo.example", timeout=0.01, max_mtu=1400)
+    assert again["cached"] is True and again["mtu"] == 1400
+
+
+def test_pmtu_single_lost_probe_is_resent(monkeypatch):
+    _fake_dns(monkeypatch)
+    path = _fake_path(1500, hint=False)
+    dropped = []
+
+    def lossy_sr(pkts, **k):
+        answered, unanswered = path(pkts, **k)
+        # lose the first 1500-byte echo on an otherwise clean path
+        for sent, reply in list(answered):
+            if len(sent) == 1500 and not dropped:
+                dropped.append(sent)
+                answered.remove((sent, reply))
+                unanswered.append(sent)
+        return answered, unanswered
+
+    monkeypatch.setattr(pmtu_mod, "sr", lossy_sr)
+    res = pmtu_mod.pmtu_discover("lossy.example", timeout=0.01)
+    assert dropped
+    assert res["mtu"] == 1500
+    assert res["error"] is None
+    assert pmtu_mod.pmtu_discover("lossy.example", timeout=0.01)["mtu"] == 1500
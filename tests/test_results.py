@@ -0,0 +1,98 @@
+# tests/test_results.py
+import math
+
+import pytest
+
+from ping.results import ResultTable
+
+
+def test_result_table_roundtrip():
+    table = ResultTable()
+    table.add_result(
+        {
+            "host": "a.example",
+            "resolved_ip": "203.0.113.1",
+            "alive": True,
+            "packets_sent": 4,
+            "packets_received": 3,
+            "min_response_time": 10.123,
+            "avg_response_time": 20.456,
+            "max_response_time": 30.789,
+            "errors": ["timeout/no reply"],
+        }
+    )
+    table.add_result({"host": "b.example", "alive": False, "rtt_ms": None})
+
+    assert len(table) == 2
+    row = table[0].to_dict()
+    assert row["host"] == "a.example"
+    assert row["resolved_ip"] == "203.0.113.1"
+    assert row["alive"] is True
+    assert row["packets_received"] == 3
+    assert row["packet_loss_percent"] == 25.0
+    # float32 storage, rounded back to the usual 3 decimals
+    assert row["avg_response_time"] == 20.456
+    assert row["errors"] == ["timeout/no reply"]
+    assert table[0].error == "timeout/no reply"
+    assert "raw" not in row
+
+    down = table[1]
+    assert down.alive is False
+    assert down.rtt_ms is None
+    # rows come back with the keys they went in with
+    assert down.to_dict() == {"host": "b.example", "alive": False, "rtt_ms": None}
+
+    out = table.to_dict()
+    assert out["summary"] == {
+        "alive_count": 1,
+        "total_count": 2,
+        "success_rate": 50.0,
+    }
+
+
+def test_result_table_interns_strings():
+    table = ResultTable()
+    for i in range(100):
+        table.add(f"h{i % 2}", alive=False, error="timeout/no reply")
+    # None + two hosts + one error string
+    assert len(table._strings) == 4
+
+
+def test_result_table_raw_is_lazy():
+    class Pkt:
+        reprs = 0
+
+        def __repr__(self):
+            Pkt.reprs += 1
+            return "<Pkt>"
+
+    table = ResultTable(keep_packets=True)
+    table.add("a", alive=True, rtt_ms=1.0, icmp_type=0, packet=Pkt())
+    table.add("b", alive=True, rtt_ms=1.0, icmp_type=0, packet=Pkt())
+    table.to_dict()
+    assert Pkt.reprs == 0
+    assert table[1].raw == "<Pkt>"
+    assert table[1].to_dict(include_raw=True)["raw"] == "<Pkt>"
+    assert table[0].icmp_type == 0
+    assert not math.isnan(table._rtt_avg[0])
+
+    # packets are dropped unless asked for
+    lean = ResultTable()
+    lean.add("a", alive=True, packet=Pkt())
+    assert lean[0].raw == ""
+
+
+def test_result_table_reorder():
+    table = ResultTable(keep_packets=True)
+    table.add("c", alive=False, error="timeout")
+    table.add("a", alive=True, rtt_ms=2.0, packet="pkt-a")
+    table.add("b", alive=True, rtt_ms=3.0)
+    table.add_result({"host": "d", "alive": False, "errors": ["x", "y"]})
+    table.reorder([1, 2, 0, 3])
+    assert [r.host for r in table] == ["a", "b", "c", "d"]
+    assert [r.rtt_ms for r in table] == [2.0, 3.0, None, None]
+    assert table[2].error == "timeout"
+    assert table[0].raw == "'pkt-a'"
+    assert table[3].errors == ["x", "y"] and table[0].errors == []
+    with pytest.raises(ValueError):
+        table.reorder([0, 0, 1, 2])
@@ -0,0 +1,160 @@
+# tests/test_sweep.py
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("scapy.all")
+
+from ping import core
+
+
+def _fake(alive, delay=0.0, calls=None, name=None):
+    def probe(host, **_k):
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        return {"host": host, "alive": alive, "rtt_ms": 1.5 if alive else None}
+
+    return probe
+
+
+def test_sweep_first_alive_wins(monkeypatch):
+    calls = []
+    monkeypatch.setattr(core, "icmp_ping", _fake(False, 0.5, calls, "icmp"))
+    monkeypatch.setattr(core, "tcp_ping", _fake(True, 0.0, calls, "tcp"))
+    monkeypatch.setattr(core, "udp_ping", _fake(True, 0.0, calls, "udp"))
+
+    t0 = time.perf_counter()
+    res = core.sweep("blocked-icmp.example", stagger=0.05)
+    elapsed = time.perf_counter() - t0
+
+    assert res["alive"] is True
+    assert res["protocol"] == "tcp"
+    assert res["rtt_ms"] == 1.5
+    # didn't wait for the slow ICMP probe, and UDP never had to start
+    assert elapsed < 0.4
+    assert "udp" not in calls
+    assert set(res["cancelled"]) == {"icmp", "udp"}
+
+
+def test_sweep_failure_starts_next_early(monkeypatch):
+    monkeypatch.setattr(core, "icmp_ping", _fake(False))
+    monkeypatch.setattr(core, "tcp_ping", _fake(False))
+    monkeypatch.setattr(core, "udp_ping", _fake(False))
+
+    t0 = time.perf_counter()
+    res = core.sweep("down.example", stagger=5.0)
+    assert time.perf_counter() - t0 < 1.0
+    assert res["alive"] is False
+    assert res["cancelled"] == []
+    assert all(r["alive"] is False for r in res["results"].values())
+
+
+def test_sweep_probe_exception_is_recorded(monkeypatch):
+    def boom(*_a, **_k):
+        raise PermissionError("root required")
+
+    monkeypatch.setattr(core, "icmp_ping", boom)
+    res = core.sweep("x.example", protocols=["icmp"])
+    assert res["alive"] is False
+    assert "PermissionError" in res["results"]["icmp"]["error"]
+
+
+def test_sweep_many_hosts(monkeypatch):
+    monkeypatch.setattr(core, "icmp_ping", lambda host, **_k: {"alive": host != "down"})
+    res = core.sweep(["a", "down", "b"], protocols=["icmp"])
+    assert [r["host"] for r in res["results"]] == ["a", "down", "b"]
+    assert res["summary"]["alive_count"] == 2
+    assert res["summary"]["total_count"] == 3
+
+
+def test_iter_sweep_bounded_and_lazy(monkeypatch):
+    monkeypatch.setattr(core, "icmp_ping", lambda host, **_k: {"alive": True})
+    pulled = []
+
+    def hosts():
+        for i in range(100):
+            pulled.append(i)
+            yield f"h{i}"
+
+    it = core.iter_sweep(hosts(), protocols=["icmp"], max_workers=4)
+    first = next(it)
+    assert first["alive"] is True
+    assert len(pulled) <= 8
+    assert len(list(it)) == 99
+
+
+def test_sweep_bounds_losing_probes(monkeypatch):
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def tracked(alive, delay):
+        def probe(host, **_k):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(delay)
+            with lock:
+                state["now"] -= 1
+            return {"host": host, "alive": alive, "rtt_ms": 1.0}
+
+        return probe
+
+    monkeypatch.setattr(core, "icmp_ping", tracked(False, 0.05))
+    monkeypatch.setattr(core, "tcp_ping", tracked(True, 0.001))
+    threads_before = threading.active_count()
+
+    res = core.sweep(
+        [f"h{i}" for i in range(200)],
+        protocols=["icmp", "tcp"],
+        stagger=0.0,
+        max_workers=4,
+    )
+    assert res["summary"]["alive_count"] == 200
+    assert state["peak"] <= 4
+    # losing probes are joined with the shared pool, not left running
+    assert threading.active_count() <= threads_before + 1
+
+
+def test_sweep_accepts_iterables_and_rejects_bad_input(monkeypatch):
+    monkeypatch.setattr(core, "icmp_ping", lambda host, **_k: {"alive": True})
+    res = core.sweep(("a", "b"), protocols=["icmp"])
+    assert res["summary"]["total_count"] == 2
+    res = core.sweep((h for h in ["c"]), protocols=["icmp"])
+    assert res["results"][0]["host"] == "c"
+
+    with pytest.raises(TypeError):
+        core.sweep(42)
+    with pytest.raises(TypeError):
+        core.sweep([1, 2], protocols=["icmp"])
+
+
+def test_sweep_hosts_compact_drops_dicts_as_it_goes(monkeypatch):
+    live = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class Tracked(dict):
+        def __init__(self, *a, **k):
+            super().__init__(*a, **k)
+            with lock:
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+
+        def __del__(self):
+            with lock:
+                live["now"] -= 1
+
+    def fake_sweep_host(host, **_k):
+        # finish out of order so rows have to be put back in input order
+        time.sleep(0.002 * (hash(host) % 3))
+        n = int(host[1:])
+        return Tracked(host=host, alive=n % 2 == 0, protocol="icmp", rtt_ms=1.0)
+
+    monkeypatch.setattr(core, "sweep_host", fake_sweep_host)
+    hosts = [f"h{i}" for i in range(200)]
+    table = core.sweep_hosts(hosts, max_workers=4, compact=True)
+
+    assert [r.host for r in table] == hosts
+    assert [r.alive for r in table] == [i % 2 == 0 for i in range(200)]
+    assert live["peak"] <= 4 + 2
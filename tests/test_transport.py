@@ -0,0 +1,140 @@
+# tests/test_transport.py
+import pytest
+
+pytest.importorskip("scapy.all")
+
+from scapy.all import ARP, Ether, ICMP, IP, TCP, Raw
+
+from ping import arp, icmp, tcp, transport
+from ping.transport import (
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+    use_transport,
+)
+
+LOCAL = "192.0.2.1"
+TARGET = "198.51.100.7"
+
+
+class FakeNetwork(Transport):
+    """Answers everything after a fixed 20 ms, no sockets involved."""
+
+    def _reply(self, pkt):
+        t0 = 1000.0
+        pkt.sent_time = t0
+        if pkt.haslayer(ARP):
+            reply = Ether(src="02:00:00:00:00:07", dst=pkt.src) / ARP(
+                op=2, psrc=pkt[ARP].pdst, pdst=LOCAL, hwsrc="02:00:00:00:00:07"
+            )
+        elif pkt.haslayer(TCP):
+            reply = IP(src=pkt[IP].dst, dst=pkt[IP].src) / TCP(
+                sport=pkt[TCP].dport,
+                dport=pkt[TCP].sport,
+                flags="SA",
+                ack=pkt[TCP].seq + 1,
+            )
+        else:
+            reply = (
+                IP(src=pkt[IP].dst, dst=pkt[IP].src)
+                / ICMP(type=0, id=pkt[ICMP].id, seq=pkt[ICMP].seq)
+                / Raw(bytes(pkt[Raw]))
+            )
+        reply.time = t0 + 0.020
+        return reply
+
+    def sr1(self, pkt, timeout=1.0, **kwargs):
+        return self._reply(pkt)
+
+    def sr(self, pkts, timeout=1.0, **kwargs):
+        return [(pkts, self._reply(pkts))], []
+
+    srp = sr
+
+
+@pytest.fixture(autouse=True)
+def _local_source(monkeypatch):
+    # Fix the source address so recorded replies match their requests.
+    monkeypatch.setattr(icmp, "IP", lambda **k: IP(src=LOCAL, **k))
+    monkeypatch.setattr(tcp, "IP", lambda **k: IP(src=LOCAL, **k))
+
+
+def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "run.pcap")
+
+    with use_transport(RecordingTransport(path, inner=FakeNetwork())):
+        live_tcp = tcp.tcp_ping(TARGET, port=443)
+        live_icmp = icmp.ping_once(TARGET)
+        live_arp = arp.arp_ping("192.0.2.9")
+    assert transport.get_transport() is None
+    assert live_tcp["alive"] and live_icmp["alive"] and live_arp["alive"]
+
+    replay = ReplayTransport(path)
+    assert len(replay.exchanges) == 3
+    assert all(reply is not None for _sent, reply in replay.exchanges)
+
+    with use_transport(replay):
+        tcp_res = tcp.tcp_ping(TARGET, port=443)
+        icmp_res = icmp.ping_once(TARGET)
+        arp_res = arp.arp_ping("192.0.2.9")
+    assert tcp_res["alive"] is True
+    assert tcp_res["rtt_ms"] == pytest.approx(20.0, abs=0.01)
+    assert icmp_res["alive"] is True and icmp_res["icmp_type"] == 0
+    assert arp_res["alive"] is True
+    assert arp_res["rtt_ms"] == pytest.approx(20.0, abs=0.01)
+    assert replay.remaining == 0
+
+
+def test_replay_unanswered_and_exhausted(tmp_path):
+    path = str(tmp_path / "timeout.pcap")
+
+    class Silent(FakeNetwork):
+        def sr1(self, pkt, timeout=1.0, **kwargs):
+            pkt.sent_time = 1000.0
+            return None
+
+    with use_transport(RecordingTransport(path, inner=Silent())):
+        assert tcp.tcp_ping(TARGET, port=22)["alive"] is False
+
+    with use_transport(ReplayTransport(path)) as replay:
+        assert replay.remaining == 1
+        assert tcp.tcp_ping(TARGET, port=22)["alive"] is False
+        # nothing left to replay: behaves like a timeout
+        assert tcp.tcp_ping(TARGET, port=22)["error"] == "No response"
+
+
+def test_replay_matches_requests_not_positions(tmp_path, monkeypatch):
+    path = str(tmp_path / "mixed.pcap")
+    hosts = [f"198.51.100.{i}" for i in range(1, 6)]
+
+    with use_transport(RecordingTransport(path, inner=FakeNetwork())):
+        assert tcp.tcp_ping(TARGET, port=443)["alive"]
+        for h in hosts:
+            assert icmp.ping_once(h)["alive"]
+
+    # a replayed run from another source address, asking in another order
+    monkeypatch.setattr(icmp, "IP", lambda **k: IP(src="192.0.2.50", **k))
+    with use_transport(ReplayTransport(path)) as replay:
+        # nothing recorded for an ICMP echo to TARGET: unanswered, not alive
+        miss = icmp.ping_once(TARGET)
+        assert miss["alive"] is False
+        assert replay.remaining == 6
+
+        for h in reversed(hosts):
+            res = icmp.ping_once(h)
+            assert res["alive"] is True and res["resolved_ip"] == h
+            assert res["rtt_ms"] == pytest.approx(20.0, abs=0.01)
+        assert tcp.tcp_ping(TARGET, port=443)["alive"] is True
+        assert replay.remaining == 0
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
+
+    class L3Only(Transport):
+        def sr(self, pkts, timeout=1.0, **kwargs):
+            return [], [pkts]
+
+    with pytest.raises(TypeError):
+        L3Only()